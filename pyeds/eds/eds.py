@@ -1,12 +1,31 @@
 #  Created by Martin Strohalm, Thermo Fisher Scientific
 
 # import modules
+import copy
+import collections
 import datetime
+import itertools
+import operator
+import concurrent.futures
+import numpy
 from ..report import Report, VIEW_FILE_TAG
 from .entity import EntityItem
 from .prop import PropertyValue
 from .query import EDSQuery
 
+# define native array types of simple values
+_ARRAY_TYPES = {
+    'Int': numpy.int64,
+    'Int64': numpy.int64,
+    'Double': numpy.float64,
+    'Boolean': numpy.bool_}
+
+# define max number of cached SQL parts
+_SQL_CACHE_SIZE = 256
+
+# define max number of IDs read by single query
+_READ_MANY_BATCH = 512
+
 
 class EDS(object):
     """
@@ -32,17 +51,33 @@ class EDS(object):
     """
     
     
-    def __init__(self, report):
+    def __init__(self, report, eager_attach=True):
         """
         Initializes a new instance of EDS.
         
         Args:
             report: str
                 Path to the report file to open.
+            
+            eager_attach: bool
+                If set to True, the view file is attached once when the
+                connection is opened and kept attached until it is closed.
+                Otherwise it is attached only while reading view file columns.
         """
         
         # init report file
         self._report = Report(report)
+        self._eager_attach = eager_attach
+        
+        # init SQL, query, parsed query, path and columns cache
+        self._sql_cache = {}
+        self._query_cache = {}
+        self._parsed_cache = {}
+        self._path_cache = {}
+        self._columns_cache = {}
+        
+        # init view file flag
+        self._view_file = None
     
     
     def __enter__(self):
@@ -72,15 +107,30 @@ class EDS(object):
     
     
     def Open(self):
-        """Opens report file connection."""
+        """
+        Opens report file connection. If available and eager attaching is
+        enabled, the view file is attached as well and kept attached until the
+        connection is closed.
+        """
         
         self._report.Open()
+        
+        # attach view file
+        if self._eager_attach and self._has_view_file():
+            self._report.AttachViewFile()
     
     
     def Close(self):
         """Closes report file connection."""
         
+        # detach view file
+        if self._eager_attach and self._has_view_file():
+            self._report.DetachViewFile()
+        
         self._report.Close()
+        
+        # reset view file flag
+        self._view_file = None
     
     
     def GetPath(self, from_entity, to_entity, via=()):
@@ -88,7 +138,8 @@ class EDS(object):
         Gets the shortest connection path between two data types. Please note
         that if there are multiple paths available with the same length it is
         rather undefined, which one is taken. Be sure to use 'via' to get
-        requested path.
+        requested path. If both data types are the same, the path contains just
+        the single data type.
         
         Args:
             from_entity: str
@@ -113,26 +164,45 @@ class EDS(object):
         # prepare via
         via = set(self._replace_entity_names(via))
         
+        # check cache
+        key = (data_type1.Name, data_type2.Name, frozenset(via))
+        if key in self._path_cache:
+            return self._path_cache[key]
+        
+        # same data type
+        if data_type1 is data_type2 and via.issubset((data_type1.Name,)):
+            return (data_type1.Name,)
+        
+        # direct connection
+        if data_type1.HasConnection(data_type2.Name) and via.issubset((data_type1.Name, data_type2.Name)):
+            return (data_type1.Name, data_type2.Name)
+        
+        # use breadth-first search if no via
+        if not via:
+            best_path = tuple(x.Name for x in self._get_shortest_path(data_type1, data_type2))
+            self._path_cache[key] = best_path
+            return best_path
+        
         # init buffers
         best_path = None
         best_length = [len(self._report.DataTypes) + 1]
         
-        # generate all possible paths
-        for path in self._get_paths(data_type1, data_type2, best_length):
+        # generate all possible paths containing requested data types
+        for path in self._get_paths(data_type1, data_type2, best_length, via.difference((data_type2.Name,))):
             
             # use names only
             path = [x.Name for x in path]
             
-            # check if path contains requested data types in-between
-            if not via.issubset(path):
-                continue
-            
             # take shortest
             if not best_path or len(best_path) > len(path):
                 best_path = path
                 best_length[0] = len(path)
         
-        return tuple(best_path)
+        # store to cache
+        best_path = tuple(best_path)
+        self._path_cache[key] = best_path
+        
+        return best_path
     
     
     def Count(self, entity, query=None):
@@ -154,6 +224,9 @@ class EDS(object):
         # get data type
         data_type = self._report.GetDataType(entity)
         
+        # get query
+        query = self._get_count_query(query)
+        
         # count items
         return self._count_items(data_type, query)
     
@@ -181,6 +254,9 @@ class EDS(object):
         data_type1 = self._report.GetDataType(entity1)
         connection = data_type1.GetConnection(entity2)
         
+        # get query
+        query = self._get_count_query(query)
+        
         # count items
         return self._count_items(connection, query)
     
@@ -285,7 +361,7 @@ class EDS(object):
             exclude = exclude)
     
     
-    def ReadHierarchy(self, path, parent=None, keep=None, queries=None, properties=None, excludes=None, orders=None, descs=None, limits=None, offsets=None):
+    def ReadHierarchy(self, path, parent=None, keep=None, queries=None, properties=None, excludes=None, orders=None, descs=None, limits=None, offsets=None, workers=None):
         """
         Reads full hierarchy of items along specified path. For each returned
         item the hierarchy can be accessed via its 'Children' property. This
@@ -336,6 +412,15 @@ class EDS(object):
             
             offsets: {str:int,}
                 Starting item position for individual data types names.
+            
+            workers: int or None
+                Number of threads used to read the hierarchy below the first
+                data type in the path. Each thread uses its own connection to
+                the report file. This helps mainly for large files on slow
+                storage, where waiting for data dominates the reading. Note
+                that in this mode all the first level items are read before
+                any item is returned. If set to None, the hierarchy is read
+                sequentially.
         
         Yields:
             iter(pyeds.EntityItem,)
@@ -385,7 +470,8 @@ class EDS(object):
             keep = set(keep),
             queries = queries,
             includes = properties,
-            excludes = excludes)
+            excludes = excludes,
+            workers = workers)
     
     
     def ReadMany(self, entity, ids, properties=None, exclude=None):
@@ -420,6 +506,59 @@ class EDS(object):
             exclude = exclude)
     
     
+    def ReadAsArrays(self, entity, query=None, properties=None, exclude=None, order=None, desc=False, limit=None, offset=0):
+        """
+        Reads property values of specified data type as columns. Instead of
+        creating individual pyeds.EntityItem for each row, the values of each
+        property are collected into a single numpy.ndarray. Simple numeric
+        properties are stored using native numeric type (missing values of
+        'Double' are stored as NaN). All other properties are stored as objects
+        converted into their final type, exactly as available by 'Value' of
+        pyeds.PropertyValue.
+        
+        Args:
+            entity: str
+                Data type name.
+            
+            query: str or None
+                Items filter.
+            
+            properties: (str,) or None
+                Names of properties to read. Note that ID properties are always
+                retrieved. If set to None, all available properties are
+                retrieved.
+            
+            exclude: (str,) or None
+                Names of properties to ignore.
+            
+            order: str or None
+                Property name to use for sorting.
+            
+            desc: bool
+                Use descending order.
+            
+            limit: int or None
+                Number of items to read.
+            
+            offset: int
+                Starting item position.
+        
+        Returns:
+            {str:numpy.ndarray}
+                Property values arrays by property column name.
+        """
+        
+        # make query
+        query = self._get_query(query, order, desc, limit, offset)
+        
+        # read arrays
+        return self._read_arrays(
+            entity = entity,
+            query = query,
+            include = properties,
+            exclude = exclude)
+    
+    
     def Update(self, items, properties=None):
         """
         Updates specified properties of given items.
@@ -449,17 +588,19 @@ class EDS(object):
         data_type = items[0].Type
         
         # check same entity
-        if any(d.Type.ID != data_type.ID for d in items):
+        type_ids = {d.Type.ID for d in items}
+        if len(type_ids) != 1 or data_type.ID not in type_ids:
             raise ValueError("All items must be of the same entity!")
         
         # check if view file exists
-        view_available = self._report.HasViewFile()
+        view_available = self._has_view_file()
         
         # retrieve all dirty properties
+        dirty = None
         if properties is None:
-            props = (prop for item in items for prop in item.GetProperties())
-            props = (prop for prop in props if (prop.IsDirty and not prop.Type.Virtual))
-            properties = set(prop.Type.ColumnName for prop in props)
+            props = (prop for item in items for prop in item.IterProperties())
+            dirty = [prop for prop in props if (prop.IsDirty and not prop.Type.Virtual)]
+            properties = set(prop.Type.ColumnName for prop in dirty)
         
         # check properties
         for prop in properties:
@@ -480,19 +621,86 @@ class EDS(object):
         # update items
         self._update_items(items, properties)
         
-        # remove dirty flag
+        # remove dirty flag of retrieved properties
+        if dirty is not None:
+            for prop in dirty:
+                prop.Dirty(False)
+            return
+        
+        # remove dirty flag of specified properties, checking each type once
+        properties = frozenset(properties)
+        selected = {}
         for item in items:
-            for prop in item.GetProperties():
-                if prop.Type.ColumnName in properties or prop.Type.DisplayName in properties:
+            for prop in item.IterProperties():
+                
+                # check type
+                prop_type = prop.Type
+                match = selected.get(prop_type, None)
+                if match is None:
+                    match = prop_type.ColumnName in properties or prop_type.DisplayName in properties
+                    selected[prop_type] = match
+                
+                # remove flag
+                if match:
                     prop.Dirty(False)
     
     
-    def _get_paths(self, data_type1, data_type2, best_length, _length=1, _visited=None):
-        """Finds paths between two data types."""
+    def _fork(self):
+        """Creates new reader sharing current schema but using own connection."""
+        
+        eds = copy.copy(self)
+        eds._report = self._report.Clone()
         
-        # check length
+        return eds
+    
+    
+    def _get_shortest_path(self, data_type1, data_type2):
+        """Finds shortest path between two data types."""
+        
+        # init buffers
+        previous = {data_type1: None}
+        queue = collections.deque([data_type1])
+        
+        # walk through connections level by level
+        while queue:
+            current = queue.popleft()
+            
+            # endpoint reached
+            if current is data_type2 and current is not data_type1:
+                path = []
+                while current is not None:
+                    path.append(current)
+                    current = previous[current]
+                return path[::-1]
+            
+            # add connected data types
+            for conn in current.Connections:
+                
+                # get data type
+                data_type = conn.DataType1
+                if data_type is current:
+                    data_type = conn.DataType2
+                
+                # skip used data type
+                if data_type in previous:
+                    continue
+                
+                previous[data_type] = current
+                queue.append(data_type)
+        
+        return None
+    
+    
+    def _get_paths(self, data_type1, data_type2, best_length, via=frozenset(), _length=1, _visited=None):
+        """Finds paths between two data types going through all via types."""
+        
+        # remove current data type from remaining ones
+        if data_type1.Name in via:
+            via = via.difference((data_type1.Name,))
+        
+        # check length including remaining data types
         current_length = _length + 1
-        if best_length[0] <= current_length:
+        if best_length[0] <= current_length + len(via):
             return
         
         # be sure to set visited
@@ -513,7 +721,8 @@ class EDS(object):
             
             # endpoint reached
             if data_type is data_type2:
-                yield [data_type1, data_type2]
+                if not via:
+                    yield [data_type1, data_type2]
                 return
         
         # update visited
@@ -535,7 +744,7 @@ class EDS(object):
             # update visited
             visited.add(data_type)
             
-            for path in self._get_paths(data_type, data_type2, best_length, current_length, visited):
+            for path in self._get_paths(data_type, data_type2, best_length, via, current_length, visited):
                 yield [data_type1] + path
     
     
@@ -596,13 +805,15 @@ class EDS(object):
         sql, values = self._sql_main_file_finalize(sql, values, query, names)
         
         # execute SQL
-        results = self._report.Execute(sql, values)
+        results, positions = self._report.ExecuteIndexed(sql, values)
+        
+        # get value positions
+        fields = self._get_fields(columns, names, positions)
         
         # yield items
         for item_data in results:
-            item = EntityItem(data_type)
-            item.SetProperties(self._create_properties(columns, names, **item_data))
-            item.Lock()
+            item = EntityItem(data_type, locked=True)
+            item.SetProperties(self._create_properties(fields, item_data))
             yield item
         
         # detach view file
@@ -629,10 +840,7 @@ class EDS(object):
         sql, values = self._sql_main_file_select(columns, data_type, names)
         
         # add link IDs
-        buff = []
-        for column in data_type.IDColumns:
-            buff.append('%s%s = %s' % (data_type.TableName, column.ColumnName, names[column.ColumnName]))
-        sql += ' INNER JOIN %s %s ON %s' % (connection.TableName, connection.T_ALIAS, ' AND '.join(buff))
+        sql += self._sql_connection_join(data_type, connection, names)
         
         # add view file SQL
         if needs_view:
@@ -646,16 +854,18 @@ class EDS(object):
         sql += ' WHERE (%s)' % (' AND '.join(buff))
         
         # finalize SQL
-        sql, values = self._sql_main_file_finalize(sql, values, query, names)
+        sql, values = self._sql_main_file_finalize(sql, values, query, names, where=True)
         
         # execute SQL
-        results = self._report.Execute(sql, values)
+        results, positions = self._report.ExecuteIndexed(sql, values)
+        
+        # get value positions
+        fields = self._get_fields(columns, names, positions)
         
         # yield items
         for item_data in results:
-            item = EntityItem(data_type, connection)
-            item.SetProperties(self._create_properties(columns, names, **item_data))
-            item.Lock()
+            item = EntityItem(data_type, connection, locked=True)
+            item.SetProperties(self._create_properties(fields, item_data))
             yield item
         
         # detach view file
@@ -663,7 +873,88 @@ class EDS(object):
             self._report.DetachViewFile()
     
     
-    def _read_hierarchy(self, path, parent, keep=(), queries={}, includes={}, excludes={}):
+    def _read_connected_many(self, entity, parents, query=None, include=None, exclude=None):
+        """Reads directly connected items for each of given parents."""
+        
+        # check parents
+        if not parents:
+            return []
+        
+        # read separately if limit applies to each parent
+        if query is not None and query.extract('limit'):
+            return [list(self._read_connected(entity, p, query, include, exclude)) for p in parents]
+        
+        # get data type
+        data_type = self._report.GetDataType(entity)
+        
+        # get parent type and connection
+        parent_type = parents[0].Type
+        connection = parent_type.GetConnection(data_type.Name)
+        
+        # get columns
+        columns, names, ambiguous = self._get_columns(include, exclude, data_type, connection)
+        
+        # attach view file
+        needs_view = self._attach_view_file(columns)
+        
+        # init SQL
+        sql, values = self._sql_main_file_select(columns, data_type, names)
+        
+        # add parent IDs to selection
+        parent_names = ['%s.%s%s' % (connection.T_ALIAS, parent_type.TableName, c.ColumnName) for c in parent_type.IDColumns]
+        parent_cols = ", ".join('%s AS _P%d' % (name, i) for i, name in enumerate(parent_names))
+        sql = 'SELECT %s, %s' % (parent_cols, sql[len('SELECT '):])
+        
+        # add link IDs
+        sql += self._sql_connection_join(data_type, connection, names)
+        
+        # add view file SQL
+        if needs_view:
+            sql = self._sql_view_file_select(sql, columns, data_type)
+        
+        # init value positions
+        fields = None
+        parent_positions = None
+        
+        # read children in batches of parents
+        children = []
+        for batch, size, values in self._split_ids(parents, parent_type.IDColumns):
+            
+            # finalize SQL
+            batch_sql = sql + ' WHERE (%s)' % self._sql_ids_condition(parent_names, size)
+            batch_sql, values = self._sql_main_file_finalize(batch_sql, values, query, names, where=True)
+            
+            # execute SQL
+            results, positions = self._report.ExecuteIndexed(batch_sql, values)
+            
+            # get value positions
+            if fields is None:
+                fields = self._get_fields(columns, names, positions)
+                parent_positions = [positions['_P%d' % i] for i in range(len(parent_names))]
+            
+            # group rows by parent
+            rows = {}
+            for row in results:
+                key = tuple(row[i] for i in parent_positions)
+                rows.setdefault(key, []).append(row)
+            
+            # make items for each parent
+            for key in batch:
+                items = []
+                for item_data in rows.get(key, ()):
+                    item = EntityItem(data_type, connection, locked=True)
+                    item.SetProperties(self._create_properties(fields, item_data))
+                    items.append(item)
+                children.append(items)
+        
+        # detach view file
+        if needs_view:
+            self._report.DetachViewFile()
+        
+        return children
+    
+    
+    def _read_hierarchy(self, path, parent, keep=(), queries={}, includes={}, excludes={}, workers=None):
         """Reads connected items along the given path."""
         
         # get path
@@ -705,27 +996,135 @@ class EDS(object):
                 yield item
             return
         
-        # read further hierarchy
-        for item in items:
+        # read further hierarchy using multiple connections
+        if workers and workers > 1:
             
             # get further children
-            children = self._read_hierarchy(
+            children = self._read_hierarchy_concurrent(
+                items = list(items),
                 path = path,
-                parent = item,
+                keep = keep,
+                queries = queries,
+                includes = includes,
+                excludes = excludes,
+                workers = workers)
+            
+            # yield items
+            for item, item_children in children:
+                
+                # keep this entity
+                if entity in keep:
+                    item.AddChildren(item_children)
+                    yield item
+                
+                # keep children only
+                else:
+                    for child in item_children:
+                        yield child
+            
+            return
+        
+        # read further hierarchy in batches of items
+        items = iter(items)
+        while True:
+            
+            # get next batch
+            batch = list(itertools.islice(items, _READ_MANY_BATCH))
+            if not batch:
+                break
+            
+            # get further children
+            children = self._read_children(
+                path = path[1:],
+                parents = batch,
                 keep = keep,
                 queries = queries,
                 includes = includes,
                 excludes = excludes)
             
-            # keep this entity
-            if entity in keep:
-                item.AddChildren(children)
-                yield item
+            # yield items
+            for item, item_children in zip(batch, children):
+                
+                # keep this entity
+                if entity in keep:
+                    item.AddChildren(item_children)
+                    yield item
+                
+                # keep children only
+                else:
+                    for child in item_children:
+                        yield child
+    
+    
+    def _read_children(self, path, parents, keep, queries, includes, excludes):
+        """Reads hierarchy along given path for each of given parents."""
+        
+        # get entity
+        entity = path[0]
+        
+        # get specified settings
+        query = queries.get(entity, None)
+        include = includes.get(entity, None)
+        exclude = excludes.get(entity, None)
+        
+        # use just ID columns if to keep
+        if entity not in keep and include is None and len(path) != 1:
+            include = []
+        
+        # read direct children
+        children = self._read_connected_many(
+            entity = entity,
+            parents = parents,
+            query = query,
+            include = include,
+            exclude = exclude)
+        
+        # end of path reached
+        if len(path) == 1:
+            return children
+        
+        # read further hierarchy for all children at once
+        items = [item for item_children in children for item in item_children]
+        descendants = iter(self._read_children(path[1:], items, keep, queries, includes, excludes))
+        
+        # assign descendants to parents
+        result = []
+        for item_children in children:
             
-            # keep children only
-            else:
-                for child in children:
-                    yield child
+            buff = []
+            for item, item_descendants in zip(item_children, descendants):
+                
+                # keep this entity
+                if entity in keep:
+                    item.AddChildren(item_descendants)
+                    buff.append(item)
+                
+                # keep children only
+                else:
+                    buff += item_descendants
+            
+            result.append(buff)
+        
+        return result
+    
+    
+    def _read_hierarchy_concurrent(self, items, path, keep, queries, includes, excludes, workers):
+        """Reads hierarchy of given parents by multiple threads."""
+        
+        # split parents into chunks
+        size = max(1, -(-len(items) // (4 * workers)))
+        chunks = [items[i:i+size] for i in range(0, len(items), size)]
+        
+        # define worker task
+        def read(chunk):
+            with self._fork() as eds:
+                return eds._read_children(path[1:], chunk, keep, queries, includes, excludes)
+        
+        # read chunks
+        with concurrent.futures.ThreadPoolExecutor(workers) as executor:
+            for chunk, children in zip(chunks, executor.map(read, chunks)):
+                for item, item_children in zip(chunk, children):
+                    yield item, item_children
     
     
     def _read_many(self, entity, ids, include=None, exclude=None):
@@ -747,39 +1146,92 @@ class EDS(object):
         if needs_view:
             sql = self._sql_view_file_select(sql, columns, data_type)
         
-        # add IDs
-        buff = []
-        for column in data_type.IDColumns:
-            buff.append('%s = ?' % names[column.ColumnName])
-        sql += ' WHERE (%s)' % (' AND '.join(buff))
+        # get ID columns
+        id_columns = data_type.IDColumns
+        id_names = [names[c.ColumnName] for c in id_columns]
         
-        # read items
-        for values in ids:
-            
-            # get IDs
-            if isinstance(values, EntityItem):
-                values = values.IDs
+        # init value positions
+        fields = None
+        id_positions = None
+        
+        # read items in batches
+        for batch, size, values in self._split_ids(ids, id_columns):
             
             # execute query
-            results = self._report.Execute(sql, values)
+            batch_sql = sql + ' WHERE %s' % self._sql_ids_condition(id_names, size)
+            results, positions = self._report.ExecuteIndexed(batch_sql, values)
             
-            # yield items
-            for item_data in results:
-                item = EntityItem(data_type)
-                item.SetProperties(self._create_properties(columns, names, **item_data))
-                item.Lock()
-                yield item
+            # get value positions
+            if fields is None:
+                fields = self._get_fields(columns, names, positions)
+                lookup = {column: idx for column, idx in fields}
+                id_positions = [lookup[c] for c in id_columns]
+            
+            # get rows by IDs
+            rows = {tuple(row[i] for i in id_positions): row for row in results}
+            
+            # yield items in requested order
+            for key in batch:
+                item_data = rows.get(key, None)
+                if item_data is not None:
+                    item = EntityItem(data_type, locked=True)
+                    item.SetProperties(self._create_properties(fields, item_data))
+                    yield item
         
         # detach view file
         if needs_view:
             self._report.DetachViewFile()
     
     
+    def _read_arrays(self, entity, query=None, include=None, exclude=None):
+        """Reads property values of given data type name as arrays."""
+        
+        # get data type
+        data_type = self._report.GetDataType(entity)
+        
+        # get columns
+        columns, names, ambiguous = self._get_columns(include, exclude, data_type)
+        
+        # attach view file
+        needs_view = self._attach_view_file(columns)
+        
+        # init SQL
+        sql, values = self._sql_main_file_select(columns, data_type, names)
+        
+        # add view file SQL
+        if needs_view:
+            sql = self._sql_view_file_select(sql, columns, data_type)
+        
+        # finalize SQL
+        sql, values = self._sql_main_file_finalize(sql, values, query, names)
+        
+        # execute SQL
+        results, positions = self._report.ExecuteIndexed(sql, values)
+        
+        # get value positions
+        fields = self._get_fields(columns, names, positions)
+        
+        # fetch all rows
+        rows = results.fetchall()
+        
+        # detach view file
+        if needs_view:
+            self._report.DetachViewFile()
+        
+        # make arrays
+        arrays = {}
+        for column, idx in fields:
+            values = list(map(operator.itemgetter(idx), rows))
+            arrays[column.ColumnName] = self._create_array(column, values)
+        
+        return arrays
+    
+    
     def _update_items(self, items, include):
         """Updates specified properties of given items."""
         
         # get data type
-        data_type = self._report.GetDataType(items[0].Type.Name)
+        data_type = items[0].Type
         
         # get IDs
         id_columns = [c for c in data_type.IDColumns]
@@ -790,22 +1242,40 @@ class EDS(object):
         # attach view file
         needs_view = self._attach_view_file(columns)
         
-        # update main file
-        self._update_main_file_items(items, columns, data_type)
-        
-        # update view file
-        if needs_view:
-            self._update_view_file_items(items, columns, data_type)
+        try:
+            
+            # begin single transaction for all changes
+            self._report.Begin()
+            
+            # update main file
+            self._update_main_file_items(items, columns, data_type)
+            
+            # update view file
+            if needs_view:
+                self._update_view_file_items(items, columns, data_type)
+            
+            # log change
+            stamp = self._update_last_change("DataTypesColumns", columns)
+            
+            # commit changes
+            self._report.Commit()
         
-        # log change
-        self._update_last_change("DataTypesColumns", columns)
+        # revert partial changes, also if interrupted to not leave transaction open
+        except BaseException:
+            self._report.Rollback()
+            raise
         
-        # commit changes
-        self._report.Commit()
+        finally:
+            
+            # detach view file
+            if needs_view:
+                self._report.DetachViewFile()
         
-        # detach view file
-        if needs_view:
-            self._report.DetachViewFile()
+        # update columns time stamp once saved
+        for col in columns:
+            col.Unlock()
+            col.LastChange = stamp
+            col.Lock()
     
     
     def _update_main_file_items(self, items, columns, data_type):
@@ -819,7 +1289,7 @@ class EDS(object):
             return
         
         # get ID columns
-        id_columns = [c.ColumnName for c in data_type.IDColumns]
+        id_columns = list(data_type.IDColumnNames)
         
         # get columns
         cols = ", ".join('%s = ?' % c for c in columns)
@@ -830,10 +1300,9 @@ class EDS(object):
         # make SQL
         sql = 'UPDATE %s SET %s WHERE %s' % (data_type.TableName, cols, ids)
         
-        # set values
-        values = []
-        for i, item in enumerate(items):
-            values.append([item.GetProperty(c).RawValue for c in columns + id_columns])
+        # make values
+        names = columns + id_columns
+        values = ([item.GetProperty(c).RawValue for c in names] for item in items)
         
         # execute query
         self._report.ExecuteMany(sql, values)
@@ -850,134 +1319,188 @@ class EDS(object):
             return
         
         # get ID columns
-        id_columns = [c.ColumnName for c in data_type.IDColumns]
+        id_columns = list(data_type.IDColumnNames)
         
         # get values placeholder
         places = ", ".join(["?"] * (len(id_columns) + 1))
         
-        # update each table
+        # get IDs names
+        ids = ", ".join(id_columns)
+        
+        # get IDs values once for all tables
+        id_values = [tuple(item.GetProperty(c).RawValue for c in id_columns) for item in items]
+        
+        # update each table within current transaction
         for column in columns:
             
-            # init SQL
-            sql = 'INSERT OR REPLACE INTO %s.%s_%s' % (VIEW_FILE_TAG, data_type.TableName, column)
-            
-            # add IDs
-            ids = ", ".join('%s' % (c,) for c in id_columns)
-            sql += ' (%s, %s)' % (ids, column)
-            
-            # add placeholders
-            sql += ' VALUES (%s) ;' % places
+            # make SQL
+            sql = 'INSERT OR REPLACE INTO %s.%s_%s (%s, %s) VALUES (%s) ;' % (
+                VIEW_FILE_TAG, data_type.TableName, column, ids, column, places)
             
             # make values
-            values = []
-            for i, item in enumerate(items):
-                values.append([item.GetProperty(c).RawValue for c in id_columns + [column]])
+            values = (key + (item.GetProperty(column).RawValue,) for key, item in zip(id_values, items))
             
             # execute query
             self._report.ExecuteMany(sql, values)
     
     
     def _update_last_change(self, table_name, columns):
-        """Updates last change time stamp for given columns."""
+        """Updates last change time stamp for given columns in database."""
         
         # get current time stamp
         stamp = datetime.datetime.now(datetime.timezone.utc).isoformat(sep=" ")
         stamp = stamp.replace('+00:00', 'Z')
         
-        # update columns
-        for col in columns:
-            col.Unlock()
-            col.LastChange = stamp
-            col.Lock()
-        
-        # make query
-        sql = 'UPDATE %s SET LastChange = ? WHERE ColumnId = ?' % (table_name, )
+        # make query for all columns at once
+        sql = 'UPDATE %s SET LastChange = ? WHERE %s' % (table_name, self._sql_ids_condition(['ColumnId'], len(columns)))
         
         # get values
-        values = [(c.LastChange, c.ID) for c in columns]
+        values = [stamp] + [c.ID for c in columns]
         
         # execute query
-        self._report.ExecuteMany(sql, values)
+        self._report.Execute(sql, values)
+        
+        return stamp
     
     
     def _get_query(self, query, order, desc, limit, offset):
         """Gets query including order and limit."""
         
+        # use parsed query directly if nothing to add
+        if isinstance(query, EDSQuery) and not (order or limit or offset):
+            return query
+        
+        # get query text
+        if isinstance(query, EDSQuery):
+            text = query.query
+        else:
+            text = str(query) if query else ''
+        
         # init query
-        query = str(query) if query else ''
+        parts = [text] if text else []
         
         # add sorting if not in query
-        if order and "ORDER BY " not in query:
-            query += ' ORDER BY "%s"' % order
+        if order and "ORDER BY " not in text:
+            parts.append('ORDER BY "%s"' % order)
             if desc:
-                query += ' DESC'
+                parts.append('DESC')
         
         # add limit if not in query
-        if limit and "LIMIT " not in query:
-            query += ' LIMIT %d' % limit
+        if limit and "LIMIT " not in text:
+            parts.append('LIMIT %d' % limit)
         
         # add offset if not in query
-        if offset and "OFFSET " not in query:
-            query += ' OFFSET %d' % offset
+        if offset and "OFFSET " not in text:
+            parts.append('OFFSET %d' % offset)
+        
+        # check query
+        if not parts:
+            return None
+        
+        # join parts
+        query = " ".join(parts)
+        
+        # make query
+        return self._make_query(query)
+    
+    
+    def _get_count_query(self, query):
+        """Gets query for counting."""
         
         # check query
         if not query:
             return None
         
+        # use parsed query
+        if isinstance(query, EDSQuery):
+            return query
+        
         # make query
-        return EDSQuery(query)
+        return self._make_query(query)
+    
+    
+    def _make_query(self, query):
+        """Gets parsed query for given query string, reusing previous ones."""
+        
+        # check cache
+        parsed = self._query_cache.get(query, None)
+        if parsed is not None:
+            return parsed
+        
+        # parse query now to report syntax errors when called
+        parsed = EDSQuery(query)
+        parsed.tree
+        
+        # release cache if full
+        if len(self._query_cache) >= _SQL_CACHE_SIZE:
+            self._query_cache.clear()
+        
+        # store query
+        self._query_cache[query] = parsed
+        
+        return parsed
     
     
     def _get_columns(self, include, exclude, *sources):
         """Gets columns to be selected and all available column names."""
         
+        include = frozenset(include) if include else frozenset()
+        exclude = frozenset(exclude) if exclude else frozenset()
+        
+        # check cache
+        key = (sources, include, exclude)
+        cached = self._columns_cache.get(key, None)
+        if cached is not None:
+            return cached
+        
         columns = []
         names = {}
         ambiguous = False
         
-        include = set(include) if include else set()
-        exclude = set(exclude) if exclude else set()
-        
         # use all sources
         for source in sources:
             
             # get alias
             alias = source.T_ALIAS + "."
             
-            # process names
-            for column in source.Columns:
-                
-                # already exists
-                if column.ColumnName in names or column.DisplayName in names:
-                    ambiguous = True
-                
-                # make prefixed name
-                prefix = "" if column.IsInViewFile else alias
-                name = '%s%s' % (prefix, column.ColumnName)
-                
-                # add to names by column name
-                names[column.ColumnName] = name
-                
-                # add to names by display name
-                if column.DisplayName and column.DisplayName not in names:
-                    names[column.DisplayName] = name
-                
-                # skip if not available
-                if not column.IsAvailable or not source.IsAvailable:
-                    continue
-                
-                # allways add IDs
-                if column.IsIDColumn:
-                    columns.append(column)
-                    continue
-                
-                # check excluded
-                if column.ColumnName in exclude or column.DisplayName in exclude:
-                    continue
-                
-                # add selected columns or all if none selected
-                if not include or column.ColumnName in include or column.DisplayName in include:
-                    columns.append(column)
+            # get columns
+            source_columns = source.Columns
+            
+            # check already existing names
+            if not ambiguous:
+                existing = set(names)
+                for column in source_columns:
+                    if column.ColumnName in existing or column.DisplayName in existing:
+                        ambiguous = True
+                        break
+                    existing.add(column.ColumnName)
+                    if column.DisplayName:
+                        existing.add(column.DisplayName)
+            
+            # make prefixed names
+            prefixed = {c.ColumnName: (c.ColumnName if c.IsInViewFile else alias + c.ColumnName) for c in source_columns}
+            
+            # add to names by column name
+            names.update(prefixed)
+            
+            # add to names by display name
+            names.update({c.DisplayName: prefixed[c.ColumnName] for c in reversed(source_columns) if c.DisplayName and c.DisplayName not in names})
+            
+            # skip if not available
+            if not source.IsAvailable:
+                continue
+            
+            # add available IDs and selected columns or all if none selected
+            columns += [c for c in source_columns if c.IsAvailable and (c.IsIDColumn or (
+                c.ColumnName not in exclude and c.DisplayName not in exclude and (
+                not include or c.ColumnName in include or c.DisplayName in include)))]
+        
+        # release cache if full
+        if len(self._columns_cache) >= _SQL_CACHE_SIZE:
+            self._columns_cache.clear()
+        
+        # store to cache
+        self._columns_cache[key] = (columns, names, ambiguous)
         
         return columns, names, ambiguous
     
@@ -989,64 +1512,74 @@ class EDS(object):
         if original is None:
             return None
         
+        # make sure items can be iterated twice
+        if not isinstance(original, dict):
+            original = list(original)
+        
+        # get real names, looking up each key once
+        names = {}
+        for key in original:
+            if key not in names:
+                names[key] = self._report.GetDataType(key).Name
+        
         # replace dictionary keys
         if isinstance(original, dict):
-            converted = {}
-            for key, value in original.items():
-                entity = self._report.GetDataType(key)
-                converted[entity.Name] = value
+            return {names[key]: value for key, value in original.items()}
         
         # replace lists
-        else:
-            converted = []
-            for key in original:
-                entity = self._report.GetDataType(key)
-                converted.append(entity.Name)
-        
-        return converted
+        return [names[key] for key in original]
     
     
     def _sql_main_file_select(self, columns, data_type, names):
         """Initializes selection SQL query from data type and requested columns."""
         
+        # get table
+        table = data_type.TableName
+        
         # get selected columns names
-        columns = set(names[c.ColumnName] for c in columns)
+        selected = tuple(names[c.ColumnName] for c in columns)
+        
+        # check cache
+        key = (table, selected)
+        sql = self._sql_cache.get(key, None)
+        if sql is not None:
+            return sql, []
         
-        # ensure ID columns are always present
+        # ensure ID columns are always present, keeping order
+        columns = dict.fromkeys(selected)
         for column in data_type.IDColumns:
-            columns.add(names[column.ColumnName])
+            columns.setdefault(names[column.ColumnName], None)
         
         # make identifiers
         cols = ", ".join(columns)
         
         # make SQL
-        sql = 'SELECT %s FROM %s AS %s' % (cols, data_type.TableName, data_type.T_ALIAS)
+        sql = 'SELECT %s FROM %s AS %s' % (cols, table, data_type.T_ALIAS)
+        
+        # store to cache
+        self._cache_sql(key, sql)
         
         return sql, []
     
     
-    def _sql_main_file_finalize(self, sql, values, query, names):
+    def _sql_main_file_finalize(self, sql, values, query, names, where=False):
         """Finalizes SQL query by adding conditions, sorting and range."""
         
         # check query
-        if not query:
+        if query is None:
             return sql, values
         
-        # init query
-        if not isinstance(query, EDSQuery):
-            query = EDSQuery(query)
-        
         # parse query
-        parsed = query.parse(names)
+        parsed = self._parse_query(query, names)
         if parsed is None:
             return sql, values
         
         # add values
         values += parsed['values']
         
-        # add constraint
+        # add constraint, 'where' tells if the SQL already has WHERE clause
         if parsed['constraint']:
-            if " WHERE " in sql:
+            if where:
                 sql += ' AND (%s)' % parsed['constraint']
             else:
                 sql += ' WHERE %s' % parsed['constraint']
@@ -1062,30 +1595,108 @@ class EDS(object):
         return sql, values
     
     
+    def _parse_query(self, query, names):
+        """Parses query into SQL parts, reusing results for the same names mapping."""
+        
+        # check cache, mappings are owned by the columns cache and never modified
+        key = (query, id(names))
+        cached = self._parsed_cache.get(key, None)
+        if cached is not None and cached[0] is names:
+            return cached[1]
+        
+        # parse query
+        parsed = query.parse(names)
+        
+        # release cache if full
+        if len(self._parsed_cache) >= _SQL_CACHE_SIZE:
+            self._parsed_cache.clear()
+        
+        # store to cache, names are kept to make sure their ID is not reused
+        self._parsed_cache[key] = (names, parsed)
+        
+        return parsed
+    
+    
+    def _sql_connection_join(self, data_type, connection, names):
+        """Makes SQL to join connection table to selected data type."""
+        
+        # get ID columns names
+        id_names = tuple(names[c.ColumnName] for c in data_type.IDColumns)
+        
+        # check cache
+        key = ('JOIN', connection.TableName, data_type.TableName, id_names)
+        sql = self._sql_cache.get(key, None)
+        if sql is not None:
+            return sql
+        
+        # make link IDs
+        buff = []
+        for column, name in zip(data_type.IDColumns, id_names):
+            buff.append('%s%s = %s' % (data_type.TableName, column.ColumnName, name))
+        
+        # make SQL
+        sql = ' INNER JOIN %s %s ON %s' % (connection.TableName, connection.T_ALIAS, ' AND '.join(buff))
+        
+        # store to cache
+        self._cache_sql(key, sql)
+        
+        return sql
+    
+    
     def _sql_view_file_select(self, sql, columns, data_type):
         """Makes SQL to join view file tables and select columns."""
         
+        # get table and alias
+        table = data_type.TableName
+        alias = data_type.T_ALIAS
+        
         # get columns
-        columns = [c.ColumnName for c in columns if not c.IsIDColumn and c.IsInViewFile]
+        columns = tuple(c.ColumnName for c in columns if not c.IsIDColumn and c.IsInViewFile)
         
-        # get ID columns
-        id_columns = [c.ColumnName for c in data_type.IDColumns]
+        # check cache
+        key = (VIEW_FILE_TAG, table, columns)
+        joins = self._sql_cache.get(key, None)
+        if joins is not None:
+            return sql + joins
+        
+        # make join template with table index placeholder
+        ids = " AND ".join('%s.%s = V%%(idx)d.%s' % (alias, c.ColumnName, c.ColumnName) for c in data_type.IDColumns)
+        template = ' LEFT JOIN %s.%s_%%(column)s V%%(idx)d ON %s' % (VIEW_FILE_TAG, table, ids)
         
         # add SQL for each table
-        idx = 0
-        for column in columns:
-            idx += 1
-            ids = " AND ".join('%s.%s = V%d.%s' % (data_type.T_ALIAS, c, idx, c) for c in id_columns)
-            sql += ' LEFT JOIN %s.%s_%s V%d ON %s' % (VIEW_FILE_TAG, data_type.TableName, column, idx, ids)
+        joins = "".join(template % {'column': column, 'idx': idx} for idx, column in enumerate(columns, 1))
         
-        return sql
+        # store to cache
+        self._cache_sql(key, joins)
+        
+        return sql + joins
+    
+    
+    def _cache_sql(self, key, sql):
+        """Stores generated SQL to cache, keeping the cache size limited."""
+        
+        # release cache if full
+        if len(self._sql_cache) >= _SQL_CACHE_SIZE:
+            self._sql_cache.clear()
+        
+        # store SQL
+        self._sql_cache[key] = sql
+    
+    
+    def _has_view_file(self):
+        """Checks if view file exists, remembering the result until closed."""
+        
+        if self._view_file is None:
+            self._view_file = self._report.HasViewFile()
+        
+        return self._view_file
     
     
     def _attach_view_file(self, columns):
         """Attaches the view file if needed."""
         
         # check if view file exists
-        if not self._report.HasViewFile():
+        if not self._has_view_file():
             return False
         
         # check if needed
@@ -1098,26 +1709,131 @@ class EDS(object):
         return True
     
     
-    def _create_properties(self, columns, names, **data):
-        """Creates property items from DB data."""
+    def _sql_ids_condition(self, id_names, count):
+        """Makes SQL condition to match given number of IDs."""
+        
+        # single ID column
+        if len(id_names) == 1:
+            return '%s IN (%s)' % (id_names[0], ", ".join("?" * count))
+        
+        # make values placeholders
+        places = ", ".join(["(%s)" % ", ".join("?" * len(id_names))] * count)
+        
+        # note that plain IN (VALUES ...) would not use the IDs index
+        return '(%s) IN (SELECT * FROM (VALUES %s))' % (", ".join(id_names), places)
+    
+    
+    def _split_ids(self, ids, id_columns):
+        """Splits IDs into batches providing padded unique values for SQL."""
         
-        items = []
+        # get max number of IDs per query to keep number of values limited
+        width = len(id_columns)
+        batch_size = max(1, _READ_MANY_BATCH // width)
         
-        # create properties
+        batch = []
+        for values in itertools.chain(ids, (None,)):
+            
+            # add IDs to batch, converted to match the values read back
+            if values is not None:
+                if isinstance(values, EntityItem):
+                    batch.append(tuple(values.IDs))
+                else:
+                    batch.append(tuple(self._convert_id(v, c.CustomDataType) for v, c in zip(values, id_columns)))
+                if len(batch) < batch_size:
+                    continue
+            
+            # check batch
+            if not batch:
+                break
+            
+            # get unique IDs
+            unique = list(dict.fromkeys(batch))
+            
+            # pad values to limit number of distinct SQL statements
+            size = min(1 << (len(unique) - 1).bit_length(), batch_size)
+            values = [x for key in unique for x in key]
+            values += [None] * ((size - len(unique)) * width)
+            
+            yield batch, size, values
+            
+            batch = []
+    
+    
+    def _convert_id(self, value, data_type):
+        """Converts requested ID value to stored type as the database compares it."""
+        
+        # check type
+        if data_type.Name not in ('Int', 'Int64', 'Double', 'String'):
+            return value
+        
+        # convert numeric text, e.g. '1' or '1.0' for numeric IDs
+        number = value
+        if isinstance(value, str) and data_type.Name != 'String':
+            try:
+                number = int(value)
+            except ValueError:
+                try:
+                    number = float(value)
+                except ValueError:
+                    return value
+        
+        # convert to stored type
+        try:
+            converted = data_type.Convert(number)
+        except (TypeError, ValueError, OverflowError):
+            return value
+        
+        # keep value not matching any stored one, e.g. 1.5 for int IDs
+        if isinstance(converted, (int, float)) and converted != number:
+            return value
+        
+        return converted
+    
+    
+    def _get_fields(self, columns, names, positions):
+        """Gets columns and positions of their values within selected data."""
+        
+        fields = []
+        
+        # get column positions
         for column in columns:
             
             # get name
             name = names[column.ColumnName]
-            if name not in data:
+            if name not in positions:
                 name = column.ColumnName
             
             # check if available
-            if name not in data:
+            if name not in positions:
                 continue
             
-            # create property
-            prop = PropertyValue(column, data[name])
-            prop.Lock()
-            items.append(prop)
+            # add field
+            fields.append((column, positions[name]))
+        
+        return fields
+    
+    
+    def _create_properties(self, fields, data):
+        """Creates property items from DB data."""
+        
+        return [PropertyValue(column, data[idx], True) for column, idx in fields]
+    
+    
+    def _create_array(self, column, values):
+        """Creates array of final values from DB data."""
+        
+        # get native type for simple values
+        dtype = None
+        if column.SpecialValueType is None and column.ValueTypeConverter is None and column.CustomDataType is not None:
+            dtype = _ARRAY_TYPES.get(column.CustomDataType.Name, None)
+        
+        # use native type if possible
+        if dtype is numpy.float64 or (dtype is not None and None not in values):
+            return numpy.array(values, dtype=dtype)
+        
+        # convert values
+        array = numpy.empty(len(values), dtype=object)
+        for i, value in enumerate(values):
+            array[i] = PropertyValue(column, value).Value
         
-        return items
+        return array
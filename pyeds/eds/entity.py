@@ -4,6 +4,9 @@
 from ..report import Lockable, PropertyColumn
 from .prop import PropertyValue
 
+# define message of missing property
+_MISSING_PROPERTY = "'%s' doesn't contain property '%s'!"
+
 
 class EntityItem(Lockable):
     """
@@ -30,8 +33,10 @@ class EntityItem(Lockable):
             Child items retrieved by hierarchical reading.
     """
     
+    __slots__ = ('_type', '_connection', '_properties', '_sorted', '_names', '_children', '_ids', '__weakref__')
+    
     
-    def __init__(self, data_type, connection=None):
+    def __init__(self, data_type, connection=None, locked=False):
         """
         Initializes a new instance of EntityItem.
         
@@ -41,6 +46,9 @@ class EntityItem(Lockable):
             
             connection: pyeds.DataTypeConnection or None
                 Connection type definition to used parent data type.
+            
+            locked: bool
+                If set to True, the instance is locked right after creation.
         """
         
         super().__init__()
@@ -48,9 +56,11 @@ class EntityItem(Lockable):
         self._type = data_type
         self._connection = connection
         self._properties = []
+        self._sorted = None
         self._names = {}
         self._children = []
         self._ids = ()
+        self._locked = locked
     
     
     def __getattr__(self, attr):
@@ -66,10 +76,18 @@ class EntityItem(Lockable):
                 Requested property value.
         """
         
-        if attr.startswith('_'):
-            super().__getattribute__(attr)
+        # private attributes are not properties
+        if attr[:1] == '_':
+            return super().__getattribute__(attr)
         
-        return self.GetValue(attr, silent=False)
+        # get property value directly
+        idx = self._names.get(attr, None)
+        if idx is not None:
+            return self._properties[idx].Value
+        
+        # not available
+        message = _MISSING_PROPERTY % (self._type.Name, attr)
+        raise KeyError(message)
     
     
     def __getitem__(self, item):
@@ -137,7 +155,11 @@ class EntityItem(Lockable):
                 All defined properties.
         """
         
-        return tuple(sorted(self._properties, key=lambda p: p.Type.ColumnName))
+        # sort properties once
+        if self._sorted is None:
+            self._sorted = tuple(sorted(self._properties, key=lambda p: p.Type.ColumnName))
+        
+        return self._sorted
     
     
     @property
@@ -195,7 +217,7 @@ class EntityItem(Lockable):
             return default
         
         # not available
-        message = "'%s' doesn't contain property '%s'!" % (self._type.Name, prop_name)
+        message = _MISSING_PROPERTY % (self._type.Name, prop_name)
         raise KeyError(message)
     
     
@@ -217,7 +239,7 @@ class EntityItem(Lockable):
             return self._properties[self._names[prop_name]]
         
         # not available
-        message = "'%s' doesn't contain property '%s'!" % (self._type.Name, prop_name)
+        message = _MISSING_PROPERTY % (self._type.Name, prop_name)
         raise KeyError(message)
     
     
@@ -240,12 +262,30 @@ class EntityItem(Lockable):
             return tuple(self._properties)
         
         # get matching data purpose
-        props = []
-        for prop in self._properties:
-            if prop.Type.DataPurpose == data_purpose:
-                props.append(prop)
+        return tuple(p for p in self._properties if p.Type.DataPurpose == data_purpose)
+    
+    
+    def IterProperties(self, data_purpose=None):
+        """
+        Iterates over all properties with corresponding data purpose without
+        making a copy. If 'data_purpose' is set to None, all properties are
+        provided. Properties must not be added while iterating.
         
-        return tuple(props)
+        Args:
+            data_purpose: str or None
+                Data purpose.
+        
+        Yields:
+            iter(pyeds.PropertyValue,)
+                Properties corresponding to given data purpose.
+        """
+        
+        # return all
+        if data_purpose is None:
+            return iter(self._properties)
+        
+        # get matching data purpose
+        return (p for p in self._properties if p.Type.DataPurpose == data_purpose)
     
     
     def SetValue(self, prop_name, value):
@@ -282,20 +322,25 @@ class EntityItem(Lockable):
         """
         
         # add properties
+        start = len(self._properties)
         self._properties += props
+        self._sorted = None
+        
+        # get new property types
+        names = self._names
+        types = [(i, prop.Type) for i, prop in enumerate(self._properties[start:], start)]
         
         # lookup column names
-        for i, prop in enumerate(self._properties):
-            if prop.Type.ColumnName not in self._names:
-                self._names[prop.Type.ColumnName] = i
+        for i, prop_type in types:
+            names.setdefault(prop_type.ColumnName, i)
         
         # lookup display names
-        for i, prop in enumerate(self._properties):
-            if prop.Type.DisplayName and prop.Type.DisplayName not in self._names:
-                self._names[prop.Type.DisplayName] = i
+        for i, prop_type in types:
+            if prop_type.DisplayName:
+                names.setdefault(prop_type.DisplayName, i)
         
         # reset IDs
-        self._ids = tuple(self.GetValue(c.ColumnName) for c in self._type.IDColumns)
+        self._ids = tuple(self.GetValue(c) for c in self._type.IDColumnNames)
     
     
     def HasProperty(self, prop_name):
@@ -326,8 +371,7 @@ class EntityItem(Lockable):
                 Entity items to be added.
         """
         
-        for item in items:
-            self._children.append(item)
+        self._children.extend(items)
     
     
     def AddValue(self, value, name, position=None, align=None, template=None, converter=None):
@@ -380,11 +424,11 @@ class EntityItem(Lockable):
         column.Lock()
         
         # make property
-        prop = PropertyValue(column, value)
-        prop.Lock()
+        prop = PropertyValue(column, value, True)
         
         # add property
         self._properties.append(prop)
+        self._sorted = None
         self._names[name] = len(self._properties) - 1
     
     
@@ -2,7 +2,15 @@
 #  Adapted from Peter Norvig courses.
 
 # import modules
+import sys
 import re
+import itertools
+
+# set max number of cached parsed trees
+_TREE_CACHE_SIZE = 256
+
+# define marker of missing cached tree
+_MISSING = object()
 
 
 class Grammar(object):
@@ -38,14 +46,35 @@ class Grammar(object):
         self._rules = {}
         rules = list(rules.items()) + list(kw_rules.items())
         
-        # set rules
+        # set rules with interned names
         for key, value in rules:
             alts = str.split(value, ' | ')
-            self._rules[key] = tuple(map(str.split, alts))
+            self._rules[sys.intern(key)] = tuple(list(map(sys.intern, alt.split())) for alt in alts)
         
         # ensure whitespace set
         if "whitespace" not in self._rules:
             self._rules["whitespace"] = whitespace if whitespace is not None else ''
+        
+        # compile terminal patterns once
+        self._patterns = {}
+        tokenizer = self._rules["whitespace"] + "(%s)"
+        for key, alts in self._rules.items():
+            if key == "whitespace":
+                continue
+            for alt in alts:
+                for elm in alt:
+                    if elm not in self._rules and elm not in self._patterns:
+                        self._patterns[elm] = re.compile(tokenizer % elm)
+        
+        # resolve elements kind once as (name, pattern), pattern is None for rules
+        self._alts = {}
+        for key, alts in self._rules.items():
+            if key == "whitespace":
+                continue
+            self._alts[key] = tuple(tuple((elm, self._patterns.get(elm)) for elm in alt) for alt in alts)
+        
+        # init cache of parsed trees
+        self._trees = {}
     
     
     def __str__(self):
@@ -76,7 +105,8 @@ class Grammar(object):
         Returns:
             hierarchical list
                 Parsed text as hierarchical list of matches. Returns None if any
-                part of the text cannot be parsed.
+                part of the text cannot be parsed. The same tree is returned for
+                repeated calls and must not be modified.
         """
         
         parsed = []
@@ -86,15 +116,33 @@ class Grammar(object):
             message = "Unknown rule specified! --> '%s'" % rule
             raise KeyError(message)
         
+        # check cache
+        key = (text, rule)
+        cached = self._trees.get(key, _MISSING)
+        if cached is not _MISSING:
+            return cached
+        
+        # init memo of already parsed rules by position
+        memo = {}
+        
         # parse text
-        while text:
+        pos = 0
+        while pos < len(text):
             
-            result = self._parse(text, rule)
+            result = self._parse(text, pos, rule, memo)
             if result is None:
-                return None
+                parsed = None
+                break
             
             parsed.append(result[0])
-            text = result[1]
+            pos = result[1]
+        
+        # release cache if full
+        if len(self._trees) >= _TREE_CACHE_SIZE:
+            self._trees.clear()
+        
+        # store to cache
+        self._trees[key] = parsed
         
         # return parsed tree
         return parsed
@@ -180,55 +228,121 @@ class Grammar(object):
         if not tree:
             return values
         
-        # search tree
-        for item in tree:
-            
-            name = item[0]
-            value = item[1:]
+        # intern rule name, so equality with interned tree labels is a fast identity hit
+        rule = sys.intern(rule)
+        
+        # search tree iteratively, keeping order of matches
+        stack = [iter(tree)]
+        while stack:
             
-            # matching rule
-            if name == rule:
-                values.append(value)
+            for item in stack[-1]:
+                
+                # skip matched text
+                if isinstance(item, str):
+                    continue
+                
+                # matching rule
+                if item[0] == rule:
+                    values.append(item[1:])
+                
+                # go further
+                else:
+                    stack.append(itertools.islice(item, 1, None))
+                    break
             
-            # go further
+            # subtree finished
             else:
-                values += Grammar.extract(value, rule)
+                stack.pop()
         
         return values
     
     
-    def _parse(self, text, rule):
-        """Parses text using given rule."""
+    def _parse(self, text, pos, rule, memo):
+        """Parses text from given position using given rule."""
+        
+        rules = self._alts
+        
+        # check memo
+        if (rule, pos) in memo:
+            return memo[rule, pos]
         
-        # match rule to text
-        if rule in self._rules:
+        # init stack of rule frames as [alts, alt index, alt, elm index, tree, start, position]
+        alts = rules[rule]
+        stack = [[alts, 0, alts[0], 0, [rule], pos, pos]]
+        
+        while True:
+            
+            # get current frame
+            frame = stack[-1]
+            alt = frame[2]
+            idx = frame[3]
             
-            # try all rule alternatives
-            for alt in self._rules[rule]:
-                tree = []
-                remainder = text
+            # alternative fully matched
+            if idx == len(alt):
+                stack.pop()
                 
-                # match each rule element
-                for elm in alt:
-                    result = self._parse(remainder, elm)
-                    if result is None:
-                        tree = None
-                        break
-                    
-                    tree.append(result[0])
-                    remainder = result[1]
+                # remember result
+                result = (frame[4], frame[6])
+                memo[frame[4][0], frame[5]] = result
                 
-                # return matched tree and remainder
-                if tree is not None:
-                    return [rule]+tree, remainder 
+                # return matched tree and end position
+                if not stack:
+                    return result
+                
+                # add matched tree to parent
+                parent = stack[-1]
+                parent[4].append(frame[4])
+                parent[6] = frame[6]
+                parent[3] += 1
+                continue
             
-            return None
-        
-        # match pattern to text
-        tokenizer = self._rules["whitespace"] + "(%s)"
-        match = re.match(tokenizer % rule, text)
-        if not match:
-            return None
-        
-        # return matched part and remainder
-        return match.group(1), text[match.end():]
+            # get current element
+            elm, pattern = alt[idx]
+            
+            # match rule
+            if pattern is None:
+                
+                # use already parsed rule
+                key = (elm, frame[6])
+                if key not in memo:
+                    alts = rules[elm]
+                    stack.append([alts, 0, alts[0], 0, [elm], frame[6], frame[6]])
+                    continue
+                
+                result = memo[key]
+                if result is not None:
+                    frame[4].append(result[0])
+                    frame[6] = result[1]
+                    frame[3] = idx + 1
+                    continue
+            
+            # match pattern to text
+            else:
+                match = pattern.match(text, frame[6])
+                if match:
+                    frame[4].append(match.group(1))
+                    frame[6] = match.end()
+                    frame[3] = idx + 1
+                    continue
+            
+            # try next alternative or go back to parent
+            while True:
+                
+                # reset frame to next alternative
+                alts = frame[0]
+                idx = frame[1] + 1
+                if idx < len(alts):
+                    frame[1:5] = idx, alts[idx], 0, [frame[4][0]]
+                    frame[6] = frame[5]
+                    break
+                
+                # remember failure
+                memo[frame[4][0], frame[5]] = None
+                
+                # no more alternatives
+                stack.pop()
+                if not stack:
+                    return None
+                
+                # parent element failed as well
+                frame = stack[-1]
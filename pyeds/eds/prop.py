@@ -4,16 +4,29 @@
 from ..report import Lockable
 
 
+class _Undefined(object):
+    """Marks value, which was not converted yet."""
+    
+    def __reduce__(self):
+        """Keeps the marker unique when pickled."""
+        
+        return '_UNDEFINED'
+
+
+# define marker of not converted value
+_UNDEFINED = _Undefined()
+
+
 class PropertyValue(Lockable):
     """
     The pyeds.PropertyValue class is used to hold the actual value of a property
     retrieved by pyeds.EDS reader and stored within pyeds.EntityItem, as well as
     the full definition of the value type.
     
-    The value itself (as 'Value') is right after the reading automatically
-    converted into its final type by applying specified converters. The original
-    value can be accessed vie 'RawValue' attribute if necessary. The full type
-    definition can be accessed via 'Type' attribute.
+    The value itself (as 'Value') is automatically converted into its final type
+    by applying specified converters when accessed for the first time. The
+    original value can be accessed vie 'RawValue' attribute if necessary. The
+    full type definition can be accessed via 'Type' attribute.
     
     Attributes:
         
@@ -27,8 +40,10 @@ class PropertyValue(Lockable):
             Original value as stored in the database.
     """
     
+    __slots__ = ('_type', '_raw_value', '_value', '_dirty', '__weakref__')
+    
     
-    def __init__(self, property_type, value):
+    def __init__(self, property_type, value, locked=False):
         """
         Initializes a new instance of PropertyValue.
         
@@ -38,20 +53,24 @@ class PropertyValue(Lockable):
             
             value: ?
                 Raw value as stored in the database.
+            
+            locked: bool
+                If set to True, the instance is locked right after creation.
         """
         
         super().__init__()
         
         self._type = property_type
         self._raw_value = value
-        self._value = self._convert_value(value)
+        self._value = _UNDEFINED
         self._dirty = False
+        self._locked = locked
     
     
     def __str__(self):
         """Gets standard string representation."""
         
-        return "%s(%s)" % (self._type, self._value)
+        return "%s(%s)" % (self._type, self.Value)
     
     
     def __repr__(self):
@@ -66,11 +85,16 @@ class PropertyValue(Lockable):
         if self is other:
             return True
         
+        # compare raw values directly
         if isinstance(other, PropertyValue):
-            return self.RawValue == other.RawValue
+            return self._raw_value == other._raw_value
+        
+        # compare final value
+        value = self._value
+        if value is _UNDEFINED:
+            value = self.Value
         
-        else:
-            return self.Value == other
+        return value == other
     
     
     def __ne__(self, other):
@@ -102,6 +126,10 @@ class PropertyValue(Lockable):
                 Property value.
         """
         
+        # convert value on first access
+        if self._value is _UNDEFINED:
+            self._value = self._convert_value(self._raw_value)
+        
         return self._value
     
     
@@ -146,7 +174,7 @@ class PropertyValue(Lockable):
         value = self._create_value(value)
         
         # skip if same
-        if value == self._value:
+        if value == self.Value:
             return
         
         # convert to raw value
@@ -190,17 +218,22 @@ class PropertyValue(Lockable):
     def _convert_value(self, value):
         """Converts raw value to final type."""
         
+        prop_type = self._type
+        
         # convert value to custom data type (e.g. string, int, binary)
-        if self._type.CustomDataType is not None:
-            value = self._type.CustomDataType.Convert(value)
+        converter = prop_type.CustomDataType
+        if converter is not None:
+            value = converter.Convert(value)
         
         # convert value to special value type (e.g. enum, ddmap)
-        if self._type.SpecialValueType is not None:
-            value = self._type.SpecialValueType.Convert(value)
+        converter = prop_type.SpecialValueType
+        if converter is not None:
+            value = converter.Convert(value)
         
         # apply specific converter (e.g. traces, spectra)
-        if self._type.ValueTypeConverter is not None:
-            value = self._type.ValueTypeConverter.Convert(value)
+        converter = prop_type.ValueTypeConverter
+        if converter is not None:
+            value = converter.Convert(value)
         
         return value
     
@@ -208,17 +241,22 @@ class PropertyValue(Lockable):
     def _revert_value(self, value):
         """Reverts final value to raw type."""
         
+        prop_type = self._type
+        
         # apply specific converter (e.g. traces, spectra)
-        if self._type.ValueTypeConverter is not None:
-            value = self._type.ValueTypeConverter.Revert(value)
+        converter = prop_type.ValueTypeConverter
+        if converter is not None:
+            value = converter.Revert(value)
         
         # convert value from special value type (e.g. enum, ddmap)
-        if self._type.SpecialValueType is not None:
-            value = self._type.SpecialValueType.Revert(value)
+        converter = prop_type.SpecialValueType
+        if converter is not None:
+            value = converter.Revert(value)
         
         # convert value from custom data type (e.g. string, int, binary)
-        if self._type.CustomDataType is not None:
-            value = self._type.CustomDataType.Revert(value)
+        converter = prop_type.CustomDataType
+        if converter is not None:
+            value = converter.Revert(value)
         
         return value
     
@@ -226,16 +264,21 @@ class PropertyValue(Lockable):
     def _create_value(self, value):
         """Creates final value from naive data."""
         
+        prop_type = self._type
+        
         # apply specific converter (e.g. traces, spectra)
-        if self._type.ValueTypeConverter is not None:
-            return self._type.ValueTypeConverter.Create(value)
+        converter = prop_type.ValueTypeConverter
+        if converter is not None:
+            return converter.Create(value)
         
         # convert value to special value type (e.g. enum, ddmap)
-        if self._type.SpecialValueType is not None:
-            return self._type.SpecialValueType.Create(value)
+        converter = prop_type.SpecialValueType
+        if converter is not None:
+            return converter.Create(value)
         
         # convert value to custom data type (e.g. string, int, binary)
-        if self._type.CustomDataType is not None:
-            return self._type.CustomDataType.Create(value)
+        converter = prop_type.CustomDataType
+        if converter is not None:
+            return converter.Create(value)
         
         return value
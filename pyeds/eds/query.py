@@ -1,6 +1,8 @@
 #  Created by Martin Strohalm, Thermo Fisher Scientific
 
 # import modules
+import copy
+import itertools
 from .grammar import Grammar
 
 # create basic query grammar
@@ -50,24 +52,23 @@ class Query(object):
         """
         Initializes a new instance of Query.
         
+        The query is parsed when its tree is needed for the first time, so the
+        syntax error is raised at that point.
+        
         Args:
             query: str
                 Query string.
         """
         
         self._query = query
-        self._tree = _GRAMMAR.parse(query, 'expression')
-        
-        # check query
-        if query and (self._tree is None or len(self._tree) != 1):
-            message = "Query syntax error! --> %s" % query
-            raise ValueError(message)
+        self._tree = None
     
     
     def __str__(self):
         """Gets standard string representation."""
         
-        return Grammar.visualize(self.tree) if self.tree is not None else ""
+        tree = self.tree
+        return Grammar.visualize(tree) if tree is not None else ""
     
     
     @property
@@ -93,6 +94,10 @@ class Query(object):
                 Parsed query tree.
         """
         
+        # parse on first access
+        if self._tree is None:
+            self._tree = self._parse_query()
+        
         return self._tree
     
     
@@ -112,11 +117,25 @@ class Query(object):
         values = []
         
         # check tree
-        if not self._tree:
+        tree = self.tree
+        if not tree:
             return values
         
         # search tree
-        return Grammar.extract(self._tree, rule)
+        return Grammar.extract(tree, rule)
+    
+    
+    def _parse_query(self):
+        """Parses query string into tree."""
+        
+        tree = _GRAMMAR.parse(self._query, 'expression')
+        
+        # check query
+        if self._query and (tree is None or len(tree) != 1):
+            message = "Query syntax error! --> %s" % self._query
+            raise ValueError(message)
+        
+        return tree
 
 
 class EDSQuery(Query):
@@ -152,14 +171,17 @@ class EDSQuery(Query):
                 Dictionary of SQL query parts and values.
         """
         
-        # set columns names map
-        self._names = names
+        # check tree
+        tree = self.tree
+        if not tree:
+            return None
         
-        # extract SQL and values from tree
-        if self._tree:
-            return self._parse_expression(self._tree[0])
+        # use separate parser to allow sharing the query between threads
+        parser = copy.copy(self)
+        parser._names = names
         
-        return None
+        # extract SQL and values from tree
+        return parser._parse_expression(tree[0])
     
     
     def _parse_expression(self, expr_elm):
@@ -259,19 +281,27 @@ class EDSQuery(Query):
         if seq_elm[0] != 'sequence':
             raise KeyError("Incorrect element! --> '%s" % seq_elm[0])
         
-        # parse elements
-        for elm in seq_elm[1:]:
+        # parse elements, walking nested sequences without recursion
+        stack = [itertools.islice(seq_elm, 1, None)]
+        while stack:
             
-            # get element name
-            elm_name = elm[0]
-            
-            # parse sequence
-            if elm_name == 'sequence':
-                values += self._parse_sequence(elm)
+            for elm in stack[-1]:
+                
+                # get element name
+                elm_name = elm[0]
+                
+                # parse sequence
+                if elm_name == 'sequence':
+                    stack.append(itertools.islice(elm, 1, None))
+                    break
+                
+                # parse value
+                elif elm_name == 'value':
+                    values.append(self._parse_value(elm))
             
-            # parse value
-            elif elm_name == 'value':
-                values.append(self._parse_value(elm))
+            # sequence finished
+            else:
+                stack.pop()
         
         return values
     
@@ -286,35 +316,43 @@ class EDSQuery(Query):
         if con_elm[0] != 'constraint':
             raise KeyError("Incorrect element! --> '%s" % con_elm[0])
         
-        # parse elements
-        for elm in con_elm[1:]:
-            
-            # get element name
-            elm_name = elm[0]
+        # parse elements, walking nested constraints without recursion
+        stack = [itertools.islice(con_elm, 1, None)]
+        while stack:
             
-            # parse inner constraint
-            if elm_name == 'constraint':
-                parsed = self._parse_constraint(elm)
+            for elm in stack[-1]:
+                
+                # get element name
+                elm_name = elm[0]
+                
+                # parse inner constraint
+                if elm_name == 'constraint':
+                    stack.append(itertools.islice(elm, 1, None))
+                    break
+                
+                # parse statement
+                elif elm_name == 'statement':
+                    parsed = self._parse_statement(elm)
+                
+                # parse operand
+                elif elm_name == 'log':
+                    parsed = [elm[1]], []
+                
+                # parse group
+                elif elm_name == 'group':
+                    parsed = self._parse_group(elm)
+                
+                # unknown rule
+                else:
+                    raise KeyError("Unknown rule! --> '%s" % elm_name)
+                
+                # update SQL and values
+                sqls += parsed[0]
+                values += parsed[1]
             
-            # parse statement
-            elif elm_name == 'statement':
-                parsed = self._parse_statement(elm)
-            
-            # parse operand
-            elif elm_name == 'log':
-                parsed = [elm[1]], []
-            
-            # parse group
-            elif elm_name == 'group':
-                parsed = self._parse_group(elm)
-            
-            # unknown rule
+            # constraint finished
             else:
-                raise KeyError("Unknown rule! --> '%s" % elm_name)
-            
-            # update SQL and values
-            sqls += parsed[0]
-            values += parsed[1]
+                stack.pop()
         
         return sqls, values
     
@@ -395,11 +433,19 @@ class EDSQuery(Query):
         if in_elm[1] == 'IN':
             values = self._parse_sequence(in_elm[3])
             sql = 'IN (%s)' % (", ".join("?"*len(values)),)
+            
+            # use simple equality for single value
+            if len(values) == 1:
+                sql = '= ?'
         
         # parse NOT IN
         elif in_elm[1] == 'NOT':
             values = self._parse_sequence(in_elm[4])
             sql = 'NOT IN (%s)' % (", ".join("?"*len(values)),)
+            
+            # use simple inequality for single value
+            if len(values) == 1:
+                sql = '!= ?'
         
         # invalid element
         else:
@@ -467,19 +513,27 @@ class EDSQuery(Query):
         if ord_elm[0] != 'orders':
             raise KeyError("Incorrect element! --> '%s" % ord_elm[0])
         
-        # parse elements
-        for elm in ord_elm[1:]:
+        # parse elements, walking nested orders without recursion
+        stack = [itertools.islice(ord_elm, 1, None)]
+        while stack:
             
-            # get element name
-            elm_name = elm[0]
+            for elm in stack[-1]:
+                
+                # get element name
+                elm_name = elm[0]
+                
+                # parse orders
+                if elm_name == 'orders':
+                    stack.append(itertools.islice(elm, 1, None))
+                    break
+                
+                # parse order
+                elif elm_name == 'order':
+                    sqls.append(self._parse_order(elm))
             
-            # parse orders
-            if elm_name == 'orders':
-                sqls += self._parse_orders(elm)
-            
-            # parse order
-            elif elm_name == 'order':
-                sqls.append(self._parse_order(elm))
+            # orders finished
+            else:
+                stack.pop()
         
         return sqls
     
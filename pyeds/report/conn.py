@@ -53,6 +53,7 @@ class DataTypeConnection(Lockable):
         
         self._columns_by_name = {}
         self._columns_by_display = {}
+        self._id_columns = None
     
     
     def __str__(self):
@@ -77,8 +78,12 @@ class DataTypeConnection(Lockable):
                 ID property columns.
         """
         
-        columns = (x for x in self._columns_by_name.values() if x.IsIDColumn)
-        return tuple(sorted(columns, key=lambda x: x.IDColumnOrder))
+        # sort ID columns once
+        if self._id_columns is None:
+            columns = (x for x in self._columns_by_name.values() if x.IsIDColumn)
+            self._id_columns = tuple(sorted(columns, key=lambda x: x.IDColumnOrder))
+        
+        return self._id_columns
     
     
     @property
@@ -159,6 +164,7 @@ class DataTypeConnection(Lockable):
         
         # add column
         self._columns_by_name[column.ColumnName] = column
+        self._id_columns = None
         if column.DisplayName:
             self._columns_by_display[column.DisplayName] = column
     
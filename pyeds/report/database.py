@@ -5,6 +5,9 @@ import codecs
 import os.path
 import sqlite3 as sqlite
 
+# define size of connection page cache in KiB
+_CACHE_SIZE_KB = 65536
+
 
 class Database(object):
     """
@@ -116,7 +119,7 @@ class Database(object):
         return self._conn
     
     
-    def connect(self, row_factory=sqlite.Row, foreign_keys=True):
+    def connect(self, row_factory=sqlite.Row, foreign_keys=True, cached_statements=1024):
         """
         Increase reference counter and opens a database connection if necessary.
         
@@ -131,6 +134,11 @@ class Database(object):
             
             foreign_keys: bool
                 Specifies whether foreign keys support should be ON.
+            
+            cached_statements: int
+                Number of prepared statements kept by the connection. Repeated
+                queries with the same SQL text reuse the prepared statement
+                instead of compiling it again.
         """
         
         # increase counter
@@ -140,7 +148,7 @@ class Database(object):
         if self._conn is None:
             
             # create connection
-            self._conn = sqlite.connect(self._path)
+            self._conn = sqlite.connect(self._path, cached_statements=cached_statements)
             self._conn.row_factory = row_factory
             
             # set foreign keys
@@ -149,6 +157,10 @@ class Database(object):
                 cur.execute("PRAGMA foreign_keys = ON")
             else:
                 cur.execute("PRAGMA foreign_keys = OFF")
+            
+            # use larger page cache and keep temporary data in memory
+            cur.execute("PRAGMA cache_size = -%d" % _CACHE_SIZE_KB)
+            cur.execute("PRAGMA temp_store = MEMORY")
     
     
     def close(self, force=False):
@@ -172,7 +184,7 @@ class Database(object):
             self._conn = None
     
     
-    def execute(self, sql, values=()):
+    def execute(self, sql, values=(), tuples=False):
         """
         Executes given SQL query and returns new cursor.
         
@@ -182,6 +194,10 @@ class Database(object):
             
             values: (?,)
                 Values to be used within SQL query.
+            
+            tuples: bool
+                If set to True, the cursor returns rows as plain tuples
+                instead of using the connection row factory.
         
         Return:
             sqlite.Cursor
@@ -192,7 +208,13 @@ class Database(object):
         self._assert_connection()
         
         # execute sql query
-        return self._conn.execute(sql, values)
+        if not tuples:
+            return self._conn.execute(sql, values)
+        
+        # execute sql query with plain rows
+        cur = self._conn.cursor()
+        cur.row_factory = None
+        return cur.execute(sql, values)
     
     
     def executemany(self, sql, values=()):
@@ -238,6 +260,17 @@ class Database(object):
         return self._conn.executescript(sql)
     
     
+    def begin(self):
+        """Begins new transaction unless there is one already in progress."""
+        
+        # assert connection
+        self._assert_connection()
+        
+        # begin transaction
+        if not self._conn.in_transaction:
+            self._conn.execute("BEGIN")
+    
+    
     def commit(self):
         """Commits changes made during current transaction."""
         
@@ -248,6 +281,16 @@ class Database(object):
         self._conn.commit()
     
     
+    def rollback(self):
+        """Reverts changes made during current transaction."""
+        
+        # assert connection
+        self._assert_connection()
+        
+        # revert changes
+        self._conn.rollback()
+    
+    
     def table_exists(self, table):
         """
         Returns True if table exists, False otherwise.
@@ -40,6 +40,9 @@ class DataType(Lockable):
         IDColumns: (pyeds.PropertyColumn,)
             Collection of ID property columns sorted by rank.
         
+        IDColumnNames: (str,)
+            Names of ID property columns sorted by rank.
+        
         Columns: (pyeds.PropertyColumn,)
             Collection of available property columns.
         
@@ -75,6 +78,8 @@ class DataType(Lockable):
         
         self._columns_by_name = {}
         self._columns_by_display = {}
+        self._id_columns = None
+        self._id_column_names = None
         
         self._connections_by_name = {}
         self._connections_by_display = {}
@@ -102,8 +107,29 @@ class DataType(Lockable):
                 Sorted ID property columns.
         """
         
-        columns = (x for x in self._columns_by_name.values() if x.IsIDColumn)
-        return tuple(sorted(columns, key=lambda x: x.IDColumnOrder))
+        # sort ID columns once
+        if self._id_columns is None:
+            columns = (x for x in self._columns_by_name.values() if x.IsIDColumn)
+            self._id_columns = tuple(sorted(columns, key=lambda x: x.IDColumnOrder))
+        
+        return self._id_columns
+    
+    
+    @property
+    def IDColumnNames(self):
+        """
+        Gets sorted ID property column names.
+        
+        Returns:
+            (str,)
+                Sorted ID property column names.
+        """
+        
+        # get names once
+        if self._id_column_names is None:
+            self._id_column_names = tuple(c.ColumnName for c in self.IDColumns)
+        
+        return self._id_column_names
     
     
     @property
@@ -266,6 +292,8 @@ class DataType(Lockable):
         
         # add column
         self._columns_by_name[column.ColumnName] = column
+        self._id_columns = None
+        self._id_column_names = None
         if column.DisplayName:
             self._columns_by_display[column.DisplayName] = column
     
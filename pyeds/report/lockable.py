@@ -9,6 +9,8 @@ class Lockable(object):
     of the internal data.
     """
     
+    __slots__ = ('_locked',)
+    
     
     def __init__(self):
         """Initializes a new instance of Lockable."""
@@ -19,11 +21,12 @@ class Lockable(object):
     def __setattr__(self, name, value):
         """Sets instance attribute if allowed."""
         
-        if name == '_locked' or not getattr(self, '_locked', False):
-            super().__setattr__(name, value)
+        # private attributes are always allowed
+        if name[0] == '_':
+            object.__setattr__(self, name, value)
         
-        elif name.startswith('_'):
-            super().__setattr__(name, value)
+        elif not getattr(self, '_locked', False):
+            object.__setattr__(self, name, value)
         
         else:
             message = "%s instance is read-only! Use Unlock() first or dedicated 'set' method, but be cautious!" % self.__class__.__name__
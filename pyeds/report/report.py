@@ -1,6 +1,7 @@
 #  Created by Martin Strohalm, Thermo Fisher Scientific
 
 # import modules
+import copy
 import datetime
 import os.path
 import time
@@ -49,17 +50,22 @@ class Report(object):
     """
     
     
-    def __init__(self, path):
+    def __init__(self, path, cached_statements=1024):
         """
         Initializes a new instance of Report.
         
         Args:
             path: str
                 Path to the report file.
+            
+            cached_statements: int
+                Number of prepared SQL statements kept by the connection for
+                reuse. Increase this if many different queries are repeated.
         """
         
         # init database file
         self._db = Database(path)
+        self._cached_statements = cached_statements
         
         # init view file counter
         self._view_file_count = 0
@@ -272,6 +278,27 @@ class Report(object):
         return os.path.exists(self.ViewFilePath)
     
     
+    def Clone(self):
+        """
+        Creates new instance of Report sharing already initialized schema but
+        using its own database connection. This is useful to read the same file
+        from multiple threads, as a single connection cannot be shared.
+        
+        Returns:
+            pyeds.Report
+                Report instance with separate connection.
+        """
+        
+        # copy report
+        report = copy.copy(self)
+        
+        # init separate connection
+        report._db = Database(self.Path)
+        report._view_file_count = 0
+        
+        return report
+    
+    
     def Open(self):
         """
         Opens database connection.
@@ -281,13 +308,17 @@ class Report(object):
                 Returns True if new connection was established, False otherwise.
         """
         
-        return self._db.connect()
+        return self._db.connect(cached_statements=self._cached_statements)
     
     
     def Close(self):
         """Closes database connection."""
         
         self._db.close()
+        
+        # reset view file counter if really closed
+        if self._db.conn is None:
+            self._view_file_count = 0
     
     
     def Execute(self, sql, values=()):
@@ -313,6 +344,40 @@ class Report(object):
         return self._db.execute(sql, values)
     
     
+    def ExecuteIndexed(self, sql, values=()):
+        """
+        Executes given SQL query and returns new cursor providing the rows as
+        plain tuples together with the positions of selected columns.
+        
+        Args:
+            sql: str
+                SQL query.
+            
+            values: (?,)
+                Values to be used within SQL query.
+        
+        Return:
+            (sqlite.Cursor, {str:int})
+                Cursor pointing to query results and position of each selected
+                column name. If the same name is selected more than once, the
+                first position is used.
+        """
+        
+        # assert connection
+        self._assert_connection()
+        
+        # execute sql query
+        cur = self._db.execute(sql, values, tuples=True)
+        
+        # get column positions
+        positions = {}
+        for i, desc in enumerate(cur.description):
+            if desc[0] not in positions:
+                positions[desc[0]] = i
+        
+        return cur, positions
+    
+    
     def ExecuteMany(self, sql, values=()):
         """
         Executes given SQL query and returns new cursor.
@@ -336,6 +401,19 @@ class Report(object):
         return self._db.executemany(sql, values)
     
     
+    def Begin(self):
+        """
+        Begins new transaction. All following changes are written at once by
+        'Commit' or discarded by 'Rollback'.
+        """
+        
+        # assert connection
+        self._assert_connection()
+        
+        # begin transaction
+        self._db.begin()
+    
+    
     def Commit(self):
         """Commits current changes."""
         
@@ -346,6 +424,16 @@ class Report(object):
         self._db.commit()
     
     
+    def Rollback(self):
+        """Reverts current changes."""
+        
+        # assert connection
+        self._assert_connection()
+        
+        # revert changes
+        self._db.rollback()
+    
+    
     def Backup(self, result=True, view=True):
         """Creates database backup."""
         
@@ -366,15 +454,15 @@ class Report(object):
     def AttachViewFile(self):
         """Attaches the view file."""
         
-        # check view file
-        if not self.HasViewFile():
-            raise IOError("Expected view file is not available! -> '%s'" % self.ViewFilePath)
-        
-        # check counter
+        # check counter, already attached file needs no other check
         if self._view_file_count:
             self._view_file_count += 1
             return
         
+        # check view file
+        if not self.HasViewFile():
+            raise IOError("Expected view file is not available! -> '%s'" % self.ViewFilePath)
+        
         # attach view file
         sql = 'ATTACH "%s" AS %s' % (self.ViewFilePath, VIEW_FILE_TAG)
         self.Execute(sql)
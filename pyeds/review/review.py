@@ -248,9 +248,10 @@ class Review(object):
         self._html_file.write(html)
         
         # show children
-        if hierarchy and item.Children:
+        children = item.Children if hierarchy else ()
+        if children:
             self.OpenSection()
-            self.InsertItems(item.Children, hide, True, header)
+            self.InsertItems(children, hide, True, header)
             self.CloseSection()
     
     
@@ -659,7 +660,7 @@ class Review(object):
         
         # get properties
         properties = []
-        for prop in item.GetProperties():
+        for prop in item.IterProperties():
             if prop.Type.ColumnName in hide or prop.Type.DisplayName in hide:
                 continue
             
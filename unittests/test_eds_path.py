@@ -40,6 +40,23 @@ class TestCase(unittest.TestCase):
             
             path = eds.GetPath("Compounds", "XIC Traces", via=["Compounds per File"])
             self.assertEqual(path, model)
+    
+    
+    def test_get_path_trivial(self):
+        """Tests whether GetPath works correctly."""
+        
+        with pyeds.EDS(self.result_file) as eds:
+            
+            path = eds.GetPath("ConsolidatedUnknownCompoundItem", "Compounds")
+            self.assertEqual(path, ("ConsolidatedUnknownCompoundItem",))
+            
+            model = ("ConsolidatedUnknownCompoundItem", "UnknownCompoundInstanceItem")
+            
+            path = eds.GetPath("ConsolidatedUnknownCompoundItem", "UnknownCompoundInstanceItem")
+            self.assertEqual(path, model)
+            
+            path = eds.GetPath("Compounds", "Compounds per File", via=["Compounds"])
+            self.assertEqual(path, model)
 
 
 # run test case
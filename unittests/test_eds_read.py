@@ -171,6 +171,59 @@ class TestCase(unittest.TestCase):
             self.assertGreaterEqual(m, 0)
     
     
+    def test_read_query_parsed(self):
+        """Tests whether Read works correctly."""
+        
+        with pyeds.EDS(self.result_file) as eds:
+            
+            query = pyeds.eds.EDSQuery("NumberOfAdducts = 2")
+            
+            items = list(eds.Read("ConsolidatedUnknownCompoundItem", query=query))
+            for item in items:
+                self.assertEqual(item.GetValue("NumberOfAdducts"), 2)
+            self.assertGreater(len(items), 0)
+            
+            items35 = list(eds.Read("ConsolidatedUnknownCompoundItem", query=query, order="ID", limit=3, offset=2))
+            self.assertEqual(len(items35), 3)
+            self.assertEqual(items35[0].ID, sorted(x.ID for x in items)[2])
+    
+    
+    def test_read_query_repeated(self):
+        """Tests whether Read works correctly for the same query on different columns."""
+        
+        query = "ID < 50"
+        
+        with pyeds.EDS(self.result_file) as eds:
+            
+            compounds = [item.IDs for item in eds.Read("ConsolidatedUnknownCompoundItem", query=query)]
+            peaks = [item.IDs for item in eds.Read("ChromatogramPeakItem", query=query)]
+            selected = [item.IDs for item in eds.Read("ConsolidatedUnknownCompoundItem", query=query, properties=["Name"])]
+            
+            parent = next(iter(eds.Read("ConsolidatedUnknownCompoundItem", order="ID")))
+            connected = [item.IDs for item in eds.ReadConnected("UnknownCompoundInstanceItem", parent, query=query)]
+            
+            self.assertTrue(compounds and peaks)
+            self.assertTrue(all(x[0] < 50 for x in compounds))
+            self.assertTrue(all(x[1] < 50 for x in peaks))
+            self.assertEqual(compounds, selected)
+            self.assertEqual(eds.Count("ChromatogramPeakItem", query), len(peaks))
+        
+        with pyeds.EDS(self.result_file) as eds:
+            self.assertEqual(peaks, [item.IDs for item in eds.Read("ChromatogramPeakItem", query=query)])
+            self.assertEqual(connected, [item.IDs for item in eds.ReadConnected("UnknownCompoundInstanceItem", parent, query=query)])
+    
+    
+    def test_read_query_error(self):
+        """Tests whether Read reports query syntax error when called."""
+        
+        with pyeds.EDS(self.result_file) as eds:
+            
+            query = "ID = 1 AND"
+            self.assertRaises(ValueError, eds.Read, "ConsolidatedUnknownCompoundItem", query)
+            self.assertRaises(ValueError, eds.Count, "ConsolidatedUnknownCompoundItem", query)
+            self.assertRaises(ValueError, eds.ReadHierarchy, ["ConsolidatedUnknownCompoundItem", "UnknownCompoundInstanceItem"], queries={"UnknownCompoundInstanceItem": query})
+    
+    
     def test_read_query_view(self):
         """Tests whether Read works correctly."""
         
@@ -181,6 +234,29 @@ class TestCase(unittest.TestCase):
             self.assertGreaterEqual(i, 0)
     
     
+    def test_read_eager_attach(self):
+        """Tests whether Read works correctly with and without eager attaching."""
+        
+        results = []
+        for eager_attach in (False, True):
+            
+            eds = pyeds.EDS(self.result_file, eager_attach=eager_attach)
+            with eds:
+                
+                self.assertEqual(eds.Report._view_file_count, 1 if eager_attach else 0)
+                
+                items = list(eds.Read("ConsolidatedUnknownCompoundItem", query="Checked = 0", properties=["Checked", "Tags", "Name"], limit=10))
+                items += list(eds.ReadMany("ConsolidatedUnknownCompoundItem", [item.IDs for item in items]))
+                results.append([[p.RawValue for p in item.Properties] for item in items])
+                
+                self.assertEqual(eds.Report._view_file_count, 1 if eager_attach else 0)
+            
+            self.assertEqual(eds.Report._view_file_count, 0)
+        
+        self.assertEqual(len(results[0]), 20)
+        self.assertEqual(results[0], results[1])
+    
+    
     def test_read_query_equals(self):
         """Tests whether Read works correctly."""
         
@@ -0,0 +1,63 @@
+#  Created by Martin Strohalm, Thermo Fisher Scientific
+
+import unittest
+import numpy
+import pyeds
+
+
+class TestCase(unittest.TestCase):
+    """Test case for pyeds.EDS class."""
+    
+    
+    def setUp(self):
+        """Prepare test case data."""
+        
+        self.result_file = "../examples/data.cdResult"
+    
+    
+    def test_read_arrays(self):
+        """Tests whether ReadAsArrays works correctly."""
+        
+        with pyeds.EDS(self.result_file) as eds:
+            
+            items = list(eds.Read("ConsolidatedUnknownCompoundItem", order="ID", limit=10))
+            arrays = eds.ReadAsArrays("ConsolidatedUnknownCompoundItem", order="ID", limit=10)
+            
+            for prop in items[0].GetProperties():
+                self.assertIn(prop.Type.ColumnName, arrays)
+                self.assertEqual(len(arrays[prop.Type.ColumnName]), len(items))
+            
+            for i, item in enumerate(items):
+                self.assertEqual(arrays["ID"][i], item.ID)
+                self.assertEqual(arrays["Name"][i], item.Name)
+                self.assertEqual(arrays["Checked"][i], item.Checked)
+                self.assertEqual(arrays["Tags"][i], item.Tags)
+    
+    
+    def test_read_arrays_types(self):
+        """Tests whether ReadAsArrays works correctly."""
+        
+        with pyeds.EDS(self.result_file) as eds:
+            
+            arrays = eds.ReadAsArrays("ConsolidatedUnknownCompoundItem", properties=["MolecularWeight", "Name"], limit=10)
+            
+            self.assertEqual(arrays["ID"].dtype, numpy.int64)
+            self.assertEqual(arrays["MolecularWeight"].dtype, numpy.float64)
+            self.assertEqual(arrays["Name"].dtype, object)
+    
+    
+    def test_read_arrays_query(self):
+        """Tests whether ReadAsArrays works correctly."""
+        
+        with pyeds.EDS(self.result_file) as eds:
+            
+            arrays = eds.ReadAsArrays("ConsolidatedUnknownCompoundItem", query="MolecularWeight > 200", properties=["MolecularWeight"])
+            
+            self.assertEqual(len(arrays["ID"]), eds.Count("ConsolidatedUnknownCompoundItem", "MolecularWeight > 200"))
+            self.assertTrue(numpy.all(arrays["MolecularWeight"] > 200))
+            self.assertFalse("Name" in arrays)
+
+
+# run test case
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
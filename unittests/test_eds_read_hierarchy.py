@@ -0,0 +1,99 @@
+#  Created by Martin Strohalm, Thermo Fisher Scientific
+
+import unittest
+import unittest.mock
+import pyeds
+
+
+class TestCase(unittest.TestCase):
+    """Test case for pyeds.EDS class."""
+    
+    
+    def setUp(self):
+        """Prepare test case data."""
+        
+        self.result_file = "../examples/data.cdResult"
+        self.path = ["ConsolidatedUnknownCompoundItem", "UnknownCompoundInstanceItem", "UnknownCompoundIonInstanceItem", "ChromatogramPeakItem"]
+    
+    
+    def dump(self, items):
+        """Gets items hierarchy as nested lists of IDs and values."""
+        
+        return [(item.Type.Name, item.IDs, [p.RawValue for p in item.Properties], self.dump(item.Children)) for item in items]
+    
+    
+    def read(self, eds, path, parent, limits):
+        """Reads hierarchy parent by parent as nested lists of IDs and values."""
+        
+        # check path
+        if not path:
+            return []
+        
+        # read items
+        if parent is None:
+            items = eds.Read(path[0], limit=limits.get(path[0], None))
+        else:
+            items = eds.ReadConnected(path[0], parent, limit=limits.get(path[0], None))
+        
+        return [(item.Type.Name, item.IDs, [p.RawValue for p in item.Properties], self.read(eds, path[1:], item, limits)) for item in items]
+    
+    
+    def test_read_hierarchy_workers(self):
+        """Tests whether ReadHierarchy works correctly using multiple threads."""
+        
+        with pyeds.EDS(self.result_file) as eds:
+            
+            limits = {"ConsolidatedUnknownCompoundItem": 200}
+            
+            items = list(eds.ReadHierarchy(self.path, limits=limits))
+            self.assertEqual(len(items), 200)
+            self.assertTrue(any(item.Children for item in items))
+            
+            threaded = list(eds.ReadHierarchy(self.path, limits=limits, workers=2))
+            self.assertEqual(self.dump(items), self.dump(threaded))
+            
+            keep = ["ConsolidatedUnknownCompoundItem", "ChromatogramPeakItem"]
+            items = list(eds.ReadHierarchy(self.path, keep=keep, limits=limits))
+            threaded = list(eds.ReadHierarchy(self.path, keep=keep, limits=limits, workers=2))
+            self.assertEqual(self.dump(items), self.dump(threaded))
+    
+    
+    def test_read_hierarchy_batched(self):
+        """Tests whether ReadHierarchy works correctly for batches of parents."""
+        
+        with pyeds.EDS(self.result_file) as eds:
+            
+            path = self.path + ["MassSpectrumInfoItem"]
+            limits = {"ConsolidatedUnknownCompoundItem": 50}
+            
+            expected = self.read(eds, path, None, limits)
+            
+            items = list(eds.ReadHierarchy(path, limits=limits))
+            self.assertEqual(self.dump(items), expected)
+            
+            with unittest.mock.patch("pyeds.eds.eds._READ_MANY_BATCH", 7):
+                items = list(eds.ReadHierarchy(path, limits=limits))
+                self.assertEqual(self.dump(items), expected)
+    
+    
+    def test_read_hierarchy_batched_limit(self):
+        """Tests whether ReadHierarchy works correctly for limited children."""
+        
+        with pyeds.EDS(self.result_file) as eds:
+            
+            limits = {"ConsolidatedUnknownCompoundItem": 50, "UnknownCompoundInstanceItem": 2}
+            
+            expected = self.read(eds, self.path, None, limits)
+            self.assertTrue(any(len(x[3]) == 2 for x in expected))
+            
+            items = list(eds.ReadHierarchy(self.path, limits=limits))
+            self.assertEqual(self.dump(items), expected)
+            
+            with unittest.mock.patch("pyeds.eds.eds._READ_MANY_BATCH", 7):
+                items = list(eds.ReadHierarchy(self.path, limits=limits))
+                self.assertEqual(self.dump(items), expected)
+
+
+# run test case
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -81,6 +81,63 @@ class TestCase(unittest.TestCase):
                 self.assertFalse(item.HasProperty("ApexRT"))
                 self.assertFalse(item.HasProperty("FWHM"))
                 self.assertTrue(item.HasProperty("LeftRT"))
+    
+    
+    def test_read_many_batched(self):
+        """Tests whether ReadMany works correctly for many IDs."""
+        
+        with pyeds.EDS(self.result_file) as eds:
+            
+            ids = [item.IDs for item in eds.Read("ConsolidatedUnknownCompoundItem")]
+            self.assertTrue(len(ids) > 512)
+            
+            ids = ids[::-1]
+            items = list(eds.ReadMany("ConsolidatedUnknownCompoundItem", ids))
+            self.assertEqual(ids, [item.IDs for item in items])
+            
+            ids = [ids[2], (-1,), ids[1], ids[2]]
+            items = list(eds.ReadMany("ConsolidatedUnknownCompoundItem", ids))
+            self.assertEqual([ids[0], ids[2], ids[3]], [item.IDs for item in items])
+            
+            items = list(eds.ReadMany("ConsolidatedUnknownCompoundItem", []))
+            self.assertEqual(items, [])
+            
+            ids = [item.IDs for item in eds.Read("ChromatogramPeakItem", limit=600)]
+            self.assertEqual(len(ids[0]), 2)
+            
+            ids = ids[::-1]
+            items = list(eds.ReadMany("ChromatogramPeakItem", ids))
+            self.assertEqual(ids, [item.IDs for item in items])
+            
+            ids = [ids[2], (-1, -1), ids[1], ids[2]]
+            items = list(eds.ReadMany("ChromatogramPeakItem", ids))
+            self.assertEqual([ids[0], ids[2], ids[3]], [item.IDs for item in items])
+    
+    
+    def test_read_many_converted(self):
+        """Tests whether ReadMany works correctly for IDs of different type."""
+        
+        with pyeds.EDS(self.result_file) as eds:
+            
+            ids = [item.IDs for item in eds.Read("ConsolidatedUnknownCompoundItem", limit=10)]
+            
+            requested = [(str(x[0]),) for x in ids[:5]] + [(float(x[0]),) for x in ids[5:]]
+            items = list(eds.ReadMany("ConsolidatedUnknownCompoundItem", requested))
+            self.assertEqual(ids, [item.IDs for item in items])
+            
+            items = list(eds.ReadMany("ConsolidatedUnknownCompoundItem", [("%s.0" % ids[0][0],), (ids[1][0] + 0.5,), ("x",)]))
+            self.assertEqual([ids[0]], [item.IDs for item in items])
+            
+            ids = [item.IDs for item in eds.Read("ChromatogramPeakItem", limit=600)]
+            self.assertEqual(len(ids[0]), 2)
+            
+            requested = [(str(x[0]), float(x[1])) for x in ids]
+            items = list(eds.ReadMany("ChromatogramPeakItem", requested))
+            self.assertEqual(ids, [item.IDs for item in items])
+            
+            requested = [(float(ids[0][0]), "%s.0" % ids[0][1]), (str(ids[1][0]), ids[1][1] + 0.5)]
+            items = list(eds.ReadMany("ChromatogramPeakItem", requested))
+            self.assertEqual([ids[0]], [item.IDs for item in items])
 
 
 # run test case
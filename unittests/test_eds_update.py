@@ -1,6 +1,7 @@
 #  Created by Martin Strohalm, Thermo Fisher Scientific
 
 import unittest
+import unittest.mock
 import pyeds
 
 
@@ -38,6 +39,42 @@ class TestCase(unittest.TestCase):
         self._updateAndTest(["Name", "Checked", "Tags"], exclude=["Tags"])
     
     
+    def test_update_rollback(self):
+        """Tests whether failed Update keeps file unchanged."""
+        
+        props = ["Name", "Checked"]
+        
+        # get items
+        with pyeds.EDS(self.result_file) as eds:
+            items = list(eds.Read("ConsolidatedUnknownCompoundItem", limit=5))
+            original = [[item.GetValue(name) for name in props] for item in items]
+            stamp = eds.Report.GetDataType("ConsolidatedUnknownCompoundItem").GetColumn("Name").LastChange
+        
+        # modify items
+        for item in items:
+            item.SetValue("Name", item.Name + "_EDS_MODIFIED")
+            item.Check(not item.Checked)
+        
+        # fail while committing all changes
+        with pyeds.EDS(self.result_file) as eds:
+            with unittest.mock.patch.object(eds.Report, "Commit", side_effect=RuntimeError("Write failed")):
+                self.assertRaises(RuntimeError, eds.Update, items)
+        
+        # check time stamp not changed
+        self.assertEqual(items[0].Type.GetColumn("Name").LastChange, stamp)
+        
+        # check dirty flags kept
+        self._assertDirty(items, props, True)
+        
+        # check file not changed
+        with pyeds.EDS(self.result_file) as eds:
+            new_items = eds.ReadMany("ConsolidatedUnknownCompoundItem", [item.IDs for item in items])
+            self.assertEqual([[item.GetValue(name) for name in props] for item in new_items], original)
+            
+            column = eds.Report.GetDataType("ConsolidatedUnknownCompoundItem").GetColumn("Name")
+            self.assertEqual(column.LastChange, stamp)
+    
+    
     def _updateAndTest(self, props, exclude=()):
         """Loads, updates and tests items."""
         
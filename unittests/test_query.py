@@ -78,13 +78,13 @@ class TestCase(unittest.TestCase):
         self.assertEqual(query['limit'], "")
         
         query = pyeds.eds.EDSQuery("Column IN (1)").parse()
-        self.assertEqual(query['constraint'], "Column IN (?)")
+        self.assertEqual(query['constraint'], "Column = ?")
         self.assertEqual(query['values'], ['1'])
         self.assertEqual(query['orderby'], "")
         self.assertEqual(query['limit'], "")
         
         query = pyeds.eds.EDSQuery("Column IN (1,)").parse()
-        self.assertEqual(query['constraint'], "Column IN (?)")
+        self.assertEqual(query['constraint'], "Column = ?")
         self.assertEqual(query['values'], ['1'])
         self.assertEqual(query['orderby'], "")
         self.assertEqual(query['limit'], "")
@@ -94,6 +94,12 @@ class TestCase(unittest.TestCase):
         self.assertEqual(query['values'], ['1', '2', '3'])
         self.assertEqual(query['orderby'], "")
         self.assertEqual(query['limit'], "")
+        
+        query = pyeds.eds.EDSQuery("Column NOT IN (1)").parse()
+        self.assertEqual(query['constraint'], "Column != ?")
+        self.assertEqual(query['values'], ['1'])
+        self.assertEqual(query['orderby'], "")
+        self.assertEqual(query['limit'], "")
     
     
     def test_and(self):
@@ -270,6 +276,71 @@ class TestCase(unittest.TestCase):
         self.assertEqual(query['values'], ['1'])
         self.assertEqual(query['orderby'], "")
         self.assertEqual(query['limit'], "")
+    
+    
+    def test_repeated(self):
+        """Tests whether repeated parsing works correctly."""
+        
+        query = pyeds.eds.EDSQuery("Column1 = 1 AND Column2 IN (2, 3)")
+        names1 = {"Column1": "T1.Column1", "Column2": "T1.Column2"}
+        names2 = {"Column1": "T2.Column1", "Column2": "T2.Column2"}
+        
+        parsed = query.parse(names1)
+        self.assertEqual(parsed['constraint'], "T1.Column1 = ? AND T1.Column2 IN (?, ?)")
+        self.assertEqual(parsed['values'], ['1', '2', '3'])
+        
+        parsed['values'].append('4')
+        
+        parsed = query.parse(names1)
+        self.assertEqual(parsed['constraint'], "T1.Column1 = ? AND T1.Column2 IN (?, ?)")
+        self.assertEqual(parsed['values'], ['1', '2', '3'])
+        
+        parsed = query.parse(names2)
+        self.assertEqual(parsed['constraint'], "T2.Column1 = ? AND T2.Column2 IN (?, ?)")
+        self.assertEqual(parsed['values'], ['1', '2', '3'])
+    
+    
+    def test_repeated_modified(self):
+        """Tests whether repeated parsing works correctly for modified names."""
+        
+        query = pyeds.eds.EDSQuery("Name = 1")
+        names = {"Name": "T.Name"}
+        
+        parsed = query.parse(names)
+        self.assertEqual(parsed['constraint'], "T.Name = ?")
+        
+        names["Name"] = "X.Name"
+        
+        parsed = query.parse(names)
+        self.assertEqual(parsed['constraint'], "X.Name = ?")
+        
+        del names["Name"]
+        self.assertRaises(KeyError, query.parse, names)
+    
+    
+    def test_long(self):
+        """Tests whether long queries work correctly."""
+        
+        items = [str(x) for x in range(2000)]
+        
+        query = pyeds.eds.EDSQuery("Column IN (%s)" % ", ".join(items)).parse()
+        self.assertEqual(query['constraint'], "Column IN (%s)" % ", ".join("?"*len(items)))
+        self.assertEqual(query['values'], items)
+        
+        query = pyeds.eds.EDSQuery(" OR ".join("Column = %s" % x for x in items)).parse()
+        self.assertEqual(query['constraint'], " OR ".join("Column = ?" for x in items))
+        self.assertEqual(query['values'], items)
+    
+    
+    def test_syntax_error(self):
+        """Tests whether syntax error is raised on first use."""
+        
+        query = pyeds.eds.EDSQuery("Column1 = 1 AND")
+        self.assertEqual(query.query, "Column1 = 1 AND")
+        self.assertRaises(ValueError, query.parse)
+        
+        query = pyeds.eds.EDSQuery("Column1 = (1")
+        self.assertRaises(ValueError, lambda: query.tree)
 
 
 # run test case